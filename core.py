@@ -1,7 +1,14 @@
 from numbers import Number
+import concurrent.futures
 import math
 import knapsack
 
+# NumPy is optional, it is only needed for the job frame
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # ----------------------------------------------------------------------------------------------------------------------
 # ----------------------------------------------------------------------------------------------------------------------
 # ------------------------------------------ Global variables ----------------------------------------------------------
@@ -9,13 +16,51 @@ import knapsack
 # List of conditions available for the Substrate class condition property.
 CONDITION_OPTIONS = ['good', 'okay', 'poor']
 
+# ----------------------------------------------------------------------------------------------------------------------
+# ----------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------ Revision tracking ---------------------------------------------------------
+
+# Parent class for the surface, substrate, paint and painting surface classes which counts every change to an object's
+# properties in its revision, so a price worked out from the object can tell when it needs working out again. A frozen
+# object has no revision and can't be changed, which keeps the objects shared through the catalogue the same for every
+# surface using them.
+class Revisioned:
+    __slots__ = ('revision',)
+
+    def __setattr__(self, name, value):
+        revision = getattr(self, 'revision', 0)
+        assert revision is not None, f'{type(self).__name__} object is frozen and can not be changed'
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, 'revision', revision + 1)
+
+    # Method to stop any further changes to the object's properties
+    def freeze(self):
+        object.__setattr__(self, 'revision', None)
+
+    # Method to check whether the object has been frozen
+    def is_frozen(self):
+        return getattr(self, 'revision', 0) is None
+
+    # Method to restore an unpickled or copied object without counting the restored properties as changes, so a frozen
+    # object stays frozen and prices cached before pickling still match the revisions they were worked out at
+    def __setstate__(self, state):
+        dict_state, slots_state = state if isinstance(state, tuple) else (state, None)
+        for name, value in {**(dict_state or {}), **(slots_state or {})}.items():
+            object.__setattr__(self, name, value)
+
+
 # ----------------------------------------------------------------------------------------------------------------------
 # ----------------------------------------------------------------------------------------------------------------------
 # ------------------------------------------ Surface class -------------------------------------------------------------
 
 #  Creating a class for the surface object in RemoteQuote which will be the parent class to
 #  different types of surface object. The Surface class has fundamental properties such as surface area and substrate.
-class Surface:
+#  The surface classes use slots instead of an instance dictionary to keep large jobs small in memory, the subclasses
+#  add no properties so their slots are empty.
+class Surface(Revisioned):
+    __slots__ = ('area', 'length', 'width', 'labour_adjustment', 'substrate', 'design', 'design_options',
+                 'description', 'name', 'num_panes', 'room_name')
+
     def __init__(
             self,
             area=None,
@@ -70,6 +115,8 @@ class Surface:
 #Different surface types containing default labour adjustment settings and design options specific to each surface type
 
 class Wall(Surface):
+    __slots__ = ()
+
     def __init__(self, *args, labour_adjustment=None, **kwargs):
         # Setting the name and description properties for the Wall class.
         description = 'An interior wall'
@@ -81,6 +128,8 @@ class Wall(Surface):
 
 
 class Ceiling(Surface):
+    __slots__ = ()
+
     def __init__(self, *args, labour_adjustment=None, **kwargs):
         # Setting the description and name properties  for the Ceiling class
         description = 'An interior ceiling'
@@ -93,19 +142,22 @@ class Ceiling(Surface):
 
 
 class Door(Surface):
+    __slots__ = ()
+    # Tuple containing design options for Door, shared by every door.
+    DESIGN_OPTIONS = ('Panelled', 'Flat door', 'Cutting in')
+
     def __init__(self, *args, labour_adjustment=None, design=None, num_panes=None, **kwargs):
         # Setting the name and description properties for the Door class
         description = 'One side of an interior door'
         name = 'Door'
-        # List containing design options for Door.
-        design_options = ['Panelled', 'Flat door', 'Cutting in']
+        design_options = self.DESIGN_OPTIONS
         # ensuring that a cutting in door must have at least one pane of glass, else it is not a cutting in door.
         if design == 'Cutting in' and num_panes is None:
             num_panes = 1
         elif num_panes is None:
             num_panes = 0
         # validation of design argument, if it is passed in it needs to be in the programmed options.
-        assert design in (design_options + [None]), 'input needs to be "Panelled", "Flat door", "Cutting in" or None'
+        assert design in design_options + (None,), 'input needs to be "Panelled", "Flat door", "Cutting in" or None'
         assert isinstance(num_panes, int) and num_panes >= 0, 'Input "num_panes" needs to be a non-negative integer'
         # setting the default design to flat door when there is no panes of glass and no design argument provided.
         if num_panes > 0 and design is None:
@@ -132,12 +184,15 @@ class Door(Surface):
 
 
 class Doorframe(Surface):
+    __slots__ = ()
+    # Tuple containing design options for Doorframe, shared by every door frame.
+    DESIGN_OPTIONS = ('Standard', 'Victorian', 'Elaborate')
+
     def __init__(self, *args, labour_adjustment=None, design=None, **kwargs):
         # Setting the name and description properties for the Doorframe class.
         description = 'Room side of door frame'
         name = 'Door Frame'
-        # List containing design options for Doorframe
-        design_options = ['Standard', 'Victorian', 'Elaborate']
+        design_options = self.DESIGN_OPTIONS
         # Setting the default design and validating the design argument to make sure it is in the coded list.
         if design is None:
             design = design_options[0]
@@ -157,6 +212,8 @@ class Doorframe(Surface):
 
 
 class Skirtingboard(Surface):
+    __slots__ = ()
+
     def __init__(self, *args, labour_adjustment=None, **kwargs):
         # Setting the name and description properties for the skirting board class
         description = 'Skirting board along the bottom of a wall'
@@ -168,6 +225,8 @@ class Skirtingboard(Surface):
 
 
 class Window(Surface):
+    __slots__ = ()
+
     def __init__(self, *args, labour_adjustment=None, num_panes=1, **kwargs):
         # Setting the name and description for the Window class.
         description = 'Interior side of a window, frame included'
@@ -183,6 +242,8 @@ class Window(Surface):
 
 
 class Windowsill(Surface):
+    __slots__ = ()
+
     def __init__(self, *args, labour_adjustment=None, **kwargs):
         # Setting the name and description for the Windowsill class.
         description = 'The interior horizontal sill beneath a window'
@@ -194,12 +255,15 @@ class Windowsill(Surface):
 
 
 class Spindle(Surface):
+    __slots__ = ()
+    # Tuple containing design options for Spindle, shared by every spindle.
+    DESIGN_OPTIONS = ('Square', 'Shaped', 'Elaborate')
+
     def __init__(self, *args, labour_adjustment=None, design=None, **kwargs):
         # Setting the name and description properties for the Spindle class.
         description = 'Vertical bars underneath a handrail'
         name = 'Spindle'
-        # List containing design options for Spindle
-        design_options = ['Square', 'Shaped', 'Elaborate']
+        design_options = self.DESIGN_OPTIONS
         # Setting default design.
         if design is None:
             design = design_options[0]
@@ -219,6 +283,8 @@ class Spindle(Surface):
 
 
 class ElaborateCornice(Surface):
+    __slots__ = ()
+
     def __init__(self, *args, labour_adjustment=None, **kwargs):
         # Setting the name and description properties for the Elaborate Cornice class.
         description = 'Large ornate plaster cornice, ceiling roses or corbels'
@@ -230,6 +296,8 @@ class ElaborateCornice(Surface):
 
 
 class Radiator(Surface):
+    __slots__ = ()
+
     def __init__(self, *args, labour_adjustment=None, **kwargs):
         # Setting the name and description properties for the Radiator class.
         description = 'Enamelled modern radiator'
@@ -244,8 +312,14 @@ class Radiator(Surface):
 # ----------------------------------------------------------------------------------------------------------------------
 # ------------------------------------------ Substrate class -----------------------------------------------------------
 
-# Creating the Substrate class which represents the substrate material of a surface object.
-class Substrate:
+# Creating the Substrate class which represents the substrate material of a surface object. The substrate classes use
+# slots, and the condition options and condition assumptions are shared by every substrate instead of being copied.
+class Substrate(Revisioned):
+    __slots__ = ('num_coats', 'condition', 'preparation_factor', 'coverage_adjustment', 'condition_assumption',
+                 'primed')
+    # Adding the conditions options list as a property of the Substrate class.
+    condition_options = CONDITION_OPTIONS
+
     # Adding Substrate properties, number of coats of paint, the condition the substate is in and the coverage
     # adjustment factor which represents the effect that a substrate material has on the coverage ability of paint
     # and a boolean to hold whether the substrate has been primed or not.
@@ -258,8 +332,6 @@ class Substrate:
             primed=False
 
     ):
-        # Adding the conditions options list as a property of the Substrate class.
-        self.condition_options = CONDITION_OPTIONS
         # Validation of condition argument
         assert condition in self.condition_options + [None], \
             'Input "condition" needs to be "poor", "okay", "good" or None'
@@ -276,7 +348,7 @@ class Substrate:
             coverage_adjustment = 1
         
         if condition_assumption is None:
-            condition_assumption = ConditionAssumptions()
+            condition_assumption = CONDITION_ASSUMPTIONS
 
         self.num_coats = num_coats
         self.condition = condition
@@ -303,6 +375,8 @@ class Substrate:
 # These are substrate subclasses which represent the various materials a surface can be
 
 class Plaster(Substrate):
+    __slots__ = ()
+
     def __init__(self, *args, num_coats=None, coverage_adjustment=None, **kwargs):
         # setting the number of coats for a plaster substrate
         if num_coats is None:
@@ -315,6 +389,8 @@ class Plaster(Substrate):
 
 
 class PrePaintedEmulsion(Substrate):
+    __slots__ = ()
+
     def __init__(self, *args, num_coats=None, condition=None, coverage_adjustment=None, **kwargs):
         # Setting the number of coats for a substrate which has been previously painted with emulsion paint, the
         # number of coats is dependant on condition
@@ -331,6 +407,8 @@ class PrePaintedEmulsion(Substrate):
 
 
 class PrePaintedWood(Substrate):
+    __slots__ = ()
+
     def __init__(self, *args, num_coats=None, condition=None, coverage_adjustment=None, **kwargs):
         # setting the number of coats for pre painted woodwork, the number of coats needed is dependant upon condition
         if num_coats is None and condition == 'poor':
@@ -347,6 +425,8 @@ class PrePaintedWood(Substrate):
 
 
 class NewLiningPaper(Substrate):
+    __slots__ = ()
+
     def __init__(self, *args, num_coats=None, coverage_adjustment=None, **kwargs):
         # Setting the number of coats for new and not painted lining paper, this should always be 2 coats
         if num_coats is None:
@@ -361,6 +441,8 @@ class NewLiningPaper(Substrate):
 
 
 class Mdf(Substrate):
+    __slots__ = ()
+
     def __init__(self, *args, num_coats=None, coverage_adjustment=None, primed=False, **kwargs):
         # Setting the number of coats needed for mdf depends on whether the MDF has been primed or is pre-primed
         if num_coats is None:
@@ -377,6 +459,8 @@ class Mdf(Substrate):
 
 
 class NewWood(Substrate):
+    __slots__ = ()
+
     def __init__(self, *args, num_coats=None, coverage_adjustment=None, primed=False, **kwargs):
         # Setting the number of coats needed for new wood, this is dependant on it being primed or not.
         if num_coats is None and primed is False:
@@ -394,9 +478,12 @@ class NewWood(Substrate):
 # ----------------------------------------------------------------------------------------------------------------------
 # ------------------------------------------------------ Paint ---------------------------------------------------------
 
-# Paint objects coded here with the paint parent class first.
+# Paint objects coded here with the paint parent class first. The paint classes use slots instead of an instance
+# dictionary.
+
+class Paint(Revisioned):
+    __slots__ = ('price', 'unit', 'coverage')
 
-class Paint:
     def __init__(self, price, unit, coverage,):
         # Validating the price unit and coverage arguments for the paint class.
         assert isinstance(price, Number) and price >= 0, 'Input "price" needs to be numeric and greater than or equal' \
@@ -409,11 +496,15 @@ class Paint:
 
 
 class EmulsionPaint(Paint):
+    __slots__ = ()
+
     # Emulsion paint sub-class
     def __init__(self, price=None, unit=None, coverage=None):
         super().__init__(price, unit, coverage)
 
 class MattEmulsionPaint(EmulsionPaint):
+    __slots__ = ()
+
     # Dulux default paint with set price unit and coverage values taken from Dulux website
     def __init__(self, price=None, unit=None, coverage=None):
         if price is None:
@@ -427,6 +518,8 @@ class MattEmulsionPaint(EmulsionPaint):
 
 
 class SilkEmulsionPaint(EmulsionPaint):
+    __slots__ = ()
+
     # Dulux default paint for use in the GUI, Silk finish, with set price unit and coverage taken from Dulux's website
     def __init__(self, price=None, unit=None, coverage=None):
         if price is None:
@@ -439,6 +532,8 @@ class SilkEmulsionPaint(EmulsionPaint):
         super().__init__(price, unit, coverage)
 
 class DiamondMattEmulsion(EmulsionPaint):
+    __slots__ = ()
+
     # Dulux default paint for the GUI, Diamond matt emulsion, with price unit and coverage values set from website
     def __init__(self, price=None, unit=None, coverage=None):
         if price is None:
@@ -450,11 +545,15 @@ class DiamondMattEmulsion(EmulsionPaint):
         super().__init__(price, unit, coverage)
 
 class OilPaint(Paint):
+    __slots__ = ()
+
     # oil/solvent based paint subclass of paint
     def __init__(self, price=None, unit=None, coverage=None):
         super().__init__(price, unit, coverage)
 
 class OilEggshell(OilPaint):
+    __slots__ = ()
+
     # Eggshell finish oil paint as a subclass of oilpaint with price, unit, coverage values set from Dulux website
     def __init__(self, price=None, unit=None, coverage=None):
         if price is None:
@@ -467,6 +566,8 @@ class OilEggshell(OilPaint):
 
 
 class OilGloss(OilPaint):
+    __slots__ = ()
+
     # Gloss finish class as a child class of oil paint with values price, unit, coverage set to the values on Dulux site
     def __init__(self, price=None, unit=None, coverage=None):
         if price is None:
@@ -478,6 +579,8 @@ class OilGloss(OilPaint):
         super().__init__(price, unit, coverage)
 
 class OilSatin(OilPaint):
+    __slots__ = ()
+
     # Satin finish oil paint subclass, with price unit and coverage values defaulted to the values from Dulux website
     def __init__(self, price=None, unit=None, coverage=None):
         if price is None:
@@ -491,6 +594,8 @@ class OilSatin(OilPaint):
 
 
 class Primer(Paint):
+    __slots__ = ()
+
     # A primer subclass of paint with the values defaulted to the values of a Dulux undercoat/wood primer.
     def __init__(self, price=None, unit=None, coverage=None):
         if price is None:
@@ -502,12 +607,51 @@ class Primer(Paint):
         super().__init__(price, unit, coverage)
 
 
+# ----------------------------------------------------------------------------------------------------------------------
+# ----------------------------------------------------------------------------------------------------------------------
+# ---------------------------------------------------- Catalogue -------------------------------------------------------
+
+# The catalogue hands out one shared, frozen paint or substrate for each class and set of arguments, so a large job
+# made of surfaces with the same paints and substrates doesn't make a new object for every surface and the shared
+# objects can be told apart by identity
+class Catalogue:
+    def __init__(self):
+        self.instances = dict()
+
+    # Method to return the shared instance of the class made with the arguments, making and freezing it the first time
+    def get_instance(self, instance_class, *args, **kwargs):
+        assert isinstance(instance_class, type) and issubclass(instance_class, (Paint, Substrate)), \
+            'Input "instance_class" needs to be a Paint or Substrate class'
+        key = (instance_class, args, tuple(sorted(kwargs.items())))
+        instance = self.instances.get(key)
+        if instance is None:
+            instance = instance_class(*args, **kwargs)
+            instance.freeze()
+            self.instances[key] = instance
+        return instance
+
+    def __len__(self):
+        return len(self.instances)
+
+
+# The catalogue shared by the GUI and the optimisations
+CATALOGUE = Catalogue()
+
+
+# Function to return the shared paint or substrate from the catalogue
+def get_catalogue_instance(instance_class, *args, **kwargs):
+    return CATALOGUE.get_instance(instance_class, *args, **kwargs)
+
+
 # ----------------------------------------------------------------------------------------------------------------------
 # ----------------------------------------------------------------------------------------------------------------------
 # ----------------------------------------------- Painting Surface -----------------------------------------------------
-class PaintingSurface:
+class PaintingSurface(Revisioned):
+    __slots__ = ('surface', 'paint', 'labour_price_msq', 'total_paint_coverage', 'price_key', 'price_components')
+
     # Painting surface is a new class which takes a paint and a surface as arguments to calculate the labour and
-    # material cost of painting the surface argument with the paint argument
+    # material cost of painting the surface argument with the paint argument. The prices are worked out once and kept
+    # until the painting surface, its surface, the substrate or the paint is changed.
     def __init__(self, surface, paint, labour_price_msq=None):
         # Setting the default labour price per square metre which will be adjusted by the labour adjustment property
         # contained in the surface class passed in as an argument
@@ -520,35 +664,59 @@ class PaintingSurface:
         assert isinstance(surface, Surface), 'Input needs to be a Surface object'
         assert isinstance(paint, Paint), 'Input needs to be a Paint object'
         self.total_paint_coverage = self.get_total_paint_coverage()
+        # the cached prices are set without changing the revision
+        object.__setattr__(self, 'price_key', None)
+        object.__setattr__(self, 'price_components', None)
 
     # Function to calculate the coverage of the whole tin of paint because coverage value is given per litre on tins
     def get_total_paint_coverage(self):
         total_paint_coverage = int(self.paint.coverage * self.paint.unit)
         return total_paint_coverage
 
-    # Function to calculate the amount of paint needed, takes into account the number of coats property here as well as
-    # the coverage value, coverage adjustment value and the area to be covered
-    def get_units_of_paint(self):
+    # Function to return the revisions the cached prices depend on, replacing the substrate of the surface changes the
+    # revision of the surface and replacing the surface or the paint changes the revision of the painting surface
+    def get_price_key(self):
+        return self.revision, self.surface.revision, self.surface.substrate.revision, self.paint.revision
+
+    # Function to return the cached labour price, units of paint and paint price, working them out again when anything
+    # they depend on has changed since they were cached
+    def get_price_components(self):
+        price_key = self.get_price_key()
+        if self.price_key != price_key:
+            object.__setattr__(self, 'total_paint_coverage', self.get_total_paint_coverage())
+            object.__setattr__(self, 'price_components', self.calculate_price_components())
+            object.__setattr__(self, 'price_key', price_key)
+        return self.price_components
+
+    # Function to calculate the labour price, the amount of paint needed and the price of the paint. The amount of paint
+    # takes into account the number of coats property here as well as the coverage value, coverage adjustment value and
+    # the area to be covered, the labour price considers the area, labour price psqm, the labour adjustment value, the
+    # number of coats needed and the preparation factor
+    def calculate_price_components(self):
         units_of_paint = (
             (self.surface.area / (self.total_paint_coverage / self.surface.substrate.coverage_adjustment))
             * self.surface.substrate.num_coats)
-        return units_of_paint
+        paint_price = units_of_paint * self.paint.price
+        labour_price = self.surface.area * self.labour_price_msq * self.surface.labour_adjustment * \
+            self.surface.substrate.num_coats * self.surface.substrate.preparation_factor
+        return labour_price, units_of_paint, paint_price
 
-    # Funtion to calculate the price of the amount of paint needed to paint the surface
+    # Function to return the amount of paint needed
+    def get_units_of_paint(self):
+        return self.get_price_components()[1]
+
+    # Funtion to return the price of the amount of paint needed to paint the surface
     def get_paint_price(self):
-        paint_price = self.get_units_of_paint() * self.paint.price
-        return paint_price
+        return self.get_price_components()[2]
 
-    # Function which calculates the labour price for coating the surface, considers the area, labour price psqm, the
-    # labour adjustment value, the number of coats needed and the preparation factor
+    # Function which returns the labour price for coating the surface
     def get_labour_price(self):
-        labour_price = self.surface.area * self.labour_price_msq * self.surface.labour_adjustment * \
-            self.surface.substrate.num_coats * self.surface.substrate.preparation_factor
-        return labour_price
+        return self.get_price_components()[0]
 
-    # Get total price function to call the previous functions add the results and return a total
+    # Get total price function to add the labour and paint prices and return a total
     def get_total_price(self):
-        total_price = self.get_labour_price() + self.get_paint_price()
+        labour_price, units_of_paint, paint_price = self.get_price_components()
+        total_price = labour_price + paint_price
         return total_price
 
     # A breakdown function which creates a dictionary of the results of each calculation and returns each price,
@@ -571,6 +739,64 @@ class PaintingSurface:
 # ----------------------------------------------------------------------------------------------------------------------
 # -------------------------------------------------- Room --------------------------------------------------------------
 
+# Function to total the paint, labour and total prices, the surface area and the surface area of each substrate
+# condition of a list of painting surfaces in a single pass, reading the cached prices of each surface only once
+def get_surface_list_totals(painting_surface_list):
+    paint_price = 0
+    labour_price = 0
+    total_price = 0
+    surface_area = 0
+    surface_area_by_condition = {}
+    for painting_surface in painting_surface_list:
+        surface_labour_price, units_of_paint, surface_paint_price = painting_surface.get_price_components()
+        area = painting_surface.surface.area
+        condition = painting_surface.surface.substrate.condition
+        paint_price += surface_paint_price
+        labour_price += surface_labour_price
+        total_price += surface_labour_price + surface_paint_price
+        surface_area += area
+        surface_area_by_condition[condition] = surface_area_by_condition.get(condition, 0) + area
+    return dict(
+        paint_price=paint_price,
+        labour_price=labour_price,
+        total_price=total_price,
+        surface_area=surface_area,
+        surface_area_by_condition=surface_area_by_condition,
+    )
+
+
+# Function to add together a list of totals dictionaries, such as the totals of each room in a job
+def add_totals(totals_list):
+    paint_price = 0
+    labour_price = 0
+    total_price = 0
+    surface_area = 0
+    surface_area_by_condition = {}
+    for totals in totals_list:
+        paint_price += totals['paint_price']
+        labour_price += totals['labour_price']
+        total_price += totals['total_price']
+        surface_area += totals['surface_area']
+        for condition, area in totals['surface_area_by_condition'].items():
+            surface_area_by_condition[condition] = surface_area_by_condition.get(condition, 0) + area
+    return dict(
+        paint_price=paint_price,
+        labour_price=labour_price,
+        total_price=total_price,
+        surface_area=surface_area,
+        surface_area_by_condition=surface_area_by_condition,
+    )
+
+
+# Function to total the surface area of the conditions in the condition list from a totals dictionary
+def get_condition_surface_area(totals, condition_list):
+    condition_surface_area = 0
+    for condition, area in totals['surface_area_by_condition'].items():
+        if condition in condition_list:
+            condition_surface_area += area
+    return condition_surface_area
+
+
 # Room class which acts as a room does in a real quote and contains a list of surfaces and their costs to be totalled
 
 class Room:
@@ -589,41 +815,30 @@ class Room:
         for painting_surface in self.painting_surfaces:
             painting_surface.surface.room_name = self.name
 
+    # Method to total the prices, the surface area and the surface area of each condition in a single pass over the
+    # painting surfaces in the room, the getters below all read from it
+    def get_totals(self):
+        return get_surface_list_totals(self.painting_surfaces)
+
     # function to total the paint price from each surface in the room
     def get_paint_price(self):
-        room_paint_price = 0
-        for painting_surface in self.painting_surfaces:
-            room_paint_price += painting_surface.get_paint_price()
-        return room_paint_price
+        return self.get_totals()['paint_price']
 
     # Method to total the labour price from each surface in the surface list passed in as an argument
     def get_labour_price(self):
-        room_labour_price = 0
-        for painting_surface in self.painting_surfaces:
-            room_labour_price += painting_surface.get_labour_price()
-        return room_labour_price
+        return self.get_totals()['labour_price']
 
     # Method to calculate total price which calls the total price function from each painting surface and totals
     def get_total_price(self):
-        room_total_price = 0
-        for painting_surface in self.painting_surfaces:
-            room_total_price += painting_surface.get_total_price()
-        return room_total_price
+        return self.get_totals()['total_price']
 
     # Method to calculate the total surface area to paint in a room, this is used for the value list in the optimisation
     def get_total_surface_area(self):
-        room_surface_area = 0
-        for painting_surface in self.painting_surfaces:
-            room_surface_area += painting_surface.surface.area
-        return room_surface_area
+        return self.get_totals()['surface_area']
 
     # Method to calculate the total surface area of surfaces in poor condition within a room to optimise by condition.
     def get_total_surface_area_by_condition(self, condition_list):
-        total_surface_area_by_condition = 0
-        for painting_surface in self.painting_surfaces:
-            if painting_surface.surface.substrate.condition in condition_list:
-                total_surface_area_by_condition += painting_surface.surface.area
-        return total_surface_area_by_condition
+        return get_condition_surface_area(self.get_totals(), condition_list)
 
     # breakdown function which uses the breakdown function of each painting surface and adds all the dictionaries from
     # painting surface breakdowns into a breakdown list of dictionaries
@@ -650,27 +865,32 @@ class Job:
         if name is None:
             name = 'my job'
         self.name = name
+        # persistent optimiser created by get_optimiser so that edits can be re-optimised without a full solve
+        self.optimiser = None
+
+    # Method to total the prices and surface areas of every room in one pass, adding the totals of each room together
+    def get_totals(self):
+        return add_totals([room.get_totals() for room in self.rooms])
 
     # Method to total the paint price of each painting surface in each room for the whole job
     def get_paint_price(self):
-        total_job_paint_price = 0
-        for room in self.rooms:
-            total_job_paint_price += room.get_paint_price()
-        return total_job_paint_price
+        return self.get_totals()['paint_price']
 
     # Method to total the labour price of each painting surface in each room for the whole job
     def get_labour_price(self):
-        total_job_labour_price = 0
-        for room in self.rooms:
-            total_job_labour_price += room.get_labour_price()
-        return total_job_labour_price
+        return self.get_totals()['labour_price']
 
     # Method to total the total price of each painting surface in each room for the whole job
     def get_total_price(self):
-        total_job_price = 0
-        for room in self.rooms:
-            total_job_price += room.get_total_price()
-        return total_job_price
+        return self.get_totals()['total_price']
+
+    # Method to total the surface area of each painting surface in each room for the whole job
+    def get_total_surface_area(self):
+        return self.get_totals()['surface_area']
+
+    # Method to total the surface area of the surfaces in the conditions passed in for the whole job
+    def get_total_surface_area_by_condition(self, condition_list):
+        return get_condition_surface_area(self.get_totals(), condition_list)
 
     # Breakdown method which creates a list of the room breakdown lists which create the painting surface dictionaries
     def get_breakdown(self):
@@ -696,30 +916,73 @@ class Job:
 
         return painting_surface_list
     # Method to create area cost lists for optimisation by taking the painting surface list and extracting from each
-    # surface the area for one list and the cost for the other list so that the indexing of each list matches
+    # surface the area for one list and the cost for the other list so that the indexing of each list matches.
+    # Costs are rounded up to whole pounds unless a cost scale is given, a cost scale of 100 gives costs in pence.
+    @staticmethod
+    def get_area_cost_lists(painting_surface_list, cost_scale=1):
+        surface_area_list, painting_price_list = Job.get_area_price_lists(painting_surface_list)
+        return surface_area_list, [get_scaled_cost(price, cost_scale) for price in painting_price_list]
+
+    # Method to create the area list and the list of exact prices, before any rounding, for the optimisation
     @staticmethod
-    def get_area_cost_lists(painting_surface_list):
+    def get_area_price_lists(painting_surface_list):
 
         surface_area_list = []
         painting_price_list = []
 
-        # creating value and cost lists for knapsack
+        # creating value and price lists for knapsack
         for painting_surface in painting_surface_list:
             surface_area_list.append(painting_surface.surface.area)
-            painting_price_list.append(math.ceil(painting_surface.get_total_price()))
+            painting_price_list.append(painting_surface.get_total_price())
 
         return surface_area_list, painting_price_list
 
     # Method to optimise the job, takes in a budget as an argument and all the other information is gathered from
-    # within the job class using the job class methods.
-    def get_optimised_job(self, budget):
+    # within the job class using the job class methods. The cheapest solver for the size of the problem is picked
+    # automatically unless one of the keys of knapsack.KNAPSACK_SOLVERS is given, 'dense' works in whole pounds while
+    # the other solvers work with exact pence costs. Giving an epsilon also allows the approximate 'fptas' solver,
+    # which is guaranteed to find at least (1 - epsilon) of the best area. Painting surfaces, or rooms standing for all
+    # of their surfaces, can be given as must include, to be paid for out of the budget first, or as exclude, to be
+    # left out of the optimisation. When k is given a list of optimised jobs for the k best distinct choices of
+    # surfaces is returned instead, best first, found with one solve of the top k knapsack in whole pounds, so k can't
+    # be given with a solver or an epsilon.
+    def get_optimised_job(self, budget, solver=None, epsilon=None, must_include=None, exclude=None, k=None):
         surface_list = self.get_painting_surface_list()
-        values, costs = self.get_area_cost_lists(surface_list)
-        # next line calls the optimisation algorithm from the knapsack python file and passes in the information
-        optimal_index_list = knapsack.optimal_knapsack(budget, values, costs)
+        values, prices = self.get_area_price_lists(surface_list)
+        must_include_index_list = self.get_constraint_index_list(surface_list, must_include, 'must_include')
+        exclude_index_list = self.get_constraint_index_list(surface_list, exclude, 'exclude')
+        if k is not None:
+            assert solver is None and epsilon is None, 'Input "k" cannot be given with "solver" or "epsilon"'
+            top_k_index_lists = get_top_k_index_lists(budget, values, prices, k, must_include_index_list,
+                                                      exclude_index_list)
+            return [OptimisedJob([surface_list[i] for i in optimal_index_list], surface_list, budget, solver='top_k')
+                    for optimal_index_list in top_k_index_lists]
+        # next line reduces the problem (dropping unaffordable and dominated surfaces) before calling the optimisation
+        # algorithm from the knapsack python file, the statistics of the reduction are kept on the optimised job
+        optimal_index_list, optimisation_info = get_optimal_index_list(budget, values, prices, solver, epsilon,
+                                                                       must_include_index_list, exclude_index_list)
         optimal_surface_list = [surface_list[i] for i in optimal_index_list]
         # next line returns an instantiation of the optimised job class to contain results of optimisation
-        return OptimisedJob(optimal_surface_list, surface_list, budget)
+        return OptimisedJob(optimal_surface_list, surface_list, budget, **optimisation_info)
+
+    # Method to find the positions in the item list of the painting surfaces or rooms given as a constraint on the
+    # optimisation, rooms given when the items are painting surfaces stand for all of their painting surfaces
+    @staticmethod
+    def get_constraint_index_list(item_list, constraint_items, constraint_name):
+        if constraint_items is None:
+            return []
+        expanded_items = []
+        for item in constraint_items:
+            if isinstance(item, Room) and item_list and isinstance(item_list[0], PaintingSurface):
+                expanded_items += item.painting_surfaces
+            else:
+                expanded_items.append(item)
+        index_list = []
+        for item in expanded_items:
+            matches = [i for i, other_item in enumerate(item_list) if other_item is item]
+            assert matches, f'Input "{constraint_name}" needs to be a list of painting surfaces or rooms in the job'
+            index_list += matches
+        return index_list
 
     # Method preparing to optimise by whole rooms instead of individual surfaces,
     # adds rooms to a list and orders by total price
@@ -738,27 +1001,39 @@ class Job:
             room_surface_area_list.append(room.get_total_surface_area())
         return room_surface_area_list
 
-    # Method to create a price list from the sorted room list
-    def get_room_price_list(self, sorted_room_list):
+    # Method to create a price list from the sorted room list, in whole pounds unless a cost scale is given
+    def get_room_price_list(self, sorted_room_list, cost_scale=1):
         room_price_list = []
         for room in sorted_room_list:
-            room_price_list.append(math.ceil(room.get_total_price()))
+            room_price_list.append(get_scaled_cost(room.get_total_price(), cost_scale))
         return room_price_list
 
+    # Method to create a list of the exact total price of each room, before any rounding, from the sorted room list
+    @staticmethod
+    def get_room_total_price_list(sorted_room_list):
+        room_total_price_list = []
+        for room in sorted_room_list:
+            room_total_price_list.append(room.get_total_price())
+        return room_total_price_list
+
     # Method to optimise a job by whole rooms, takes in a budget, returns an instantiation of an optimised job class,
-    # uses the above functions to prepare the area cost lists
-    def get_optimised_rooms_job(self, budget):
+    # uses the above functions to prepare the area cost lists. Rooms can be given as must include or exclude.
+    def get_optimised_rooms_job(self, budget, solver=None, epsilon=None, must_include=None, exclude=None):
         sorted_room_list = self.get_sorted_room_list()
         room_surface_area_list = self.get_room_surface_area_list(sorted_room_list)
-        room_price_list = self.get_room_price_list(sorted_room_list)
-        # next line calls the optimisation algorithm from the knapsack python file and passes in the information
-        optimal_room_index_list = knapsack.optimal_knapsack(budget, room_surface_area_list, room_price_list)
+        room_price_list = self.get_room_total_price_list(sorted_room_list)
+        must_include_index_list = self.get_constraint_index_list(sorted_room_list, must_include, 'must_include')
+        exclude_index_list = self.get_constraint_index_list(sorted_room_list, exclude, 'exclude')
+        # next line calls the reduction and optimisation algorithm from the knapsack python file
+        optimal_room_index_list, optimisation_info = get_optimal_index_list(
+            budget, room_surface_area_list, room_price_list, solver, epsilon, must_include_index_list,
+            exclude_index_list)
         optimal_room_list = [sorted_room_list[i] for i in optimal_room_index_list]
         budgeted_painting_surface_list = self.get_painting_surface_list_from_room_list(optimal_room_list)
         original_painting_surface_list = self.get_painting_surface_list_from_room_list(sorted_room_list)
         # next line returns an instantiation of the optimised job class to contain results of optimisation
         # passes in the original list of painting surfaces and the optimised list
-        return OptimisedJob(budgeted_painting_surface_list, original_painting_surface_list, budget)
+        return OptimisedJob(budgeted_painting_surface_list, original_painting_surface_list, budget, **optimisation_info)
 
     # Method to prepare the lists for the optimisation to optimise by area of poor condition surface in a room
     def get_room_surface_area_by_condition_list(self, sorted_room_list, condition_list):
@@ -767,21 +1042,486 @@ class Job:
             room_surface_area_by_condition_list.append(room.get_total_surface_area_by_condition(condition_list))
         return room_surface_area_by_condition_list
 
-    # Method to optimise by condition, returns an optimised job object, takes in a budget to optimise to
-    def get_optimised_condition_job(self, budget):
+    # Method to optimise by condition, returns an optimised job object, takes in a budget to optimise to. Rooms can be
+    # given as must include or exclude.
+    def get_optimised_condition_job(self, budget, solver=None, epsilon=None, must_include=None, exclude=None):
         sorted_room_list = self.get_sorted_room_list()
         condition_list = ['poor']
         room_surface_area_by_condition_list = self.get_room_surface_area_by_condition_list(sorted_room_list,
                                                                                            condition_list)
-        room_price_list = self.get_room_price_list(sorted_room_list)
+        room_price_list = self.get_room_total_price_list(sorted_room_list)
+        must_include_index_list = self.get_constraint_index_list(sorted_room_list, must_include, 'must_include')
+        exclude_index_list = self.get_constraint_index_list(sorted_room_list, exclude, 'exclude')
         # calling the optimisation algorithm funtion from within the knapsack python file
-        optimal_room_index_list = knapsack.optimal_knapsack(budget, room_surface_area_by_condition_list,
-                                                            room_price_list)
+        optimal_room_index_list, optimisation_info = get_optimal_index_list(
+            budget, room_surface_area_by_condition_list, room_price_list, solver, epsilon, must_include_index_list,
+            exclude_index_list)
         optimal_room_list = [sorted_room_list[i] for i in optimal_room_index_list]
         budgeted_painting_surface_list = self.get_painting_surface_list_from_room_list(optimal_room_list)
         original_painting_surface_list = self.get_painting_surface_list_from_room_list(sorted_room_list)
         # returning an optimised job class object
-        return OptimisedJob(budgeted_painting_surface_list, original_painting_surface_list, budget)
+        return OptimisedJob(budgeted_painting_surface_list, original_painting_surface_list, budget, **optimisation_info)
+
+    # Method to optimise the job while also picking the paint finish of each surface. The paint catalogue maps names to
+    # paint classes, such as PAINT_FINISH_TYPE_TO_PAINT_CLASS_DICT in forms, and each surface can keep its own paint or
+    # switch to any catalogue paint of the same type, so emulsions are only swapped for emulsions and oil paints for oil
+    # paints. At most one paint is taken for each surface to paint the most area in the budget, the surface keeps its
+    # own paint unless switching paints more area. Costs are rounded up to whole pounds as in the dense solver.
+    def get_optimised_paint_job(self, budget, paint_catalogue):
+        surface_list = self.get_painting_surface_list()
+        option_lists = [self.get_paint_option_list(painting_surface, paint_catalogue)
+                        for painting_surface in surface_list]
+        values = []
+        costs = []
+        for option_list in option_lists:
+            option_values, option_costs = self.get_area_cost_lists(option_list)
+            values.append(option_values)
+            costs.append(option_costs)
+        chosen_options = knapsack.multiple_choice_knapsack(budget, values, costs)
+        optimal_surface_list = []
+        paint_choices = []
+        for painting_surface, option_list, option in zip(surface_list, option_lists, chosen_options):
+            if option is None:
+                continue
+            chosen_painting_surface = option_list[option]
+            optimal_surface_list.append(chosen_painting_surface)
+            paint_choices.append(dict(
+                room_name=painting_surface.surface.room_name,
+                surface_name=painting_surface.surface.name,
+                original_paint=type(painting_surface.paint).__name__,
+                chosen_paint=type(chosen_painting_surface.paint).__name__,
+            ))
+        return OptimisedJob(optimal_surface_list, surface_list, budget, solver='multiple_choice',
+                            paint_choices=paint_choices)
+
+    # Method to list the painting surfaces a surface could become with each paint it can use, the surface with its own
+    # paint comes first followed by the catalogue paints of the same type as its paint
+    @staticmethod
+    def get_paint_option_list(painting_surface, paint_catalogue):
+        option_list = [painting_surface]
+        paint_type = get_paint_type(type(painting_surface.paint))
+        if paint_type is None:
+            return option_list
+        for paint_class in paint_catalogue.values():
+            if issubclass(paint_class, paint_type) and paint_class is not type(painting_surface.paint):
+                option_list.append(PaintingSurface(painting_surface.surface, get_catalogue_instance(paint_class),
+                                                   painting_surface.labour_price_msq))
+        return option_list
+
+    # Method to optimise the job by surfaces while preferring to paint whole rooms. Every room offers the best choices
+    # of its own surfaces for each amount of its budget, found with a small knapsack over the room, and a choice which
+    # leaves some of the room unpainted loses the partial room penalty in square metres from its area. One choice, or
+    # none, is then taken for each room with a single multiple-choice knapsack over the rooms. Costs are rounded up to
+    # whole pounds.
+    def get_optimised_grouped_job(self, budget, partial_room_penalty=5):
+        assert isinstance(partial_room_penalty, Number) and partial_room_penalty >= 0, \
+            'Input "partial_room_penalty" needs to be numeric and greater than or equal to zero'
+        sorted_room_list = self.get_sorted_room_list()
+        room_option_lists = []
+        values = []
+        costs = []
+        for room in sorted_room_list:
+            room_surface_list = self.get_painting_surface_list_from_room_list([room])
+            room_values, room_costs = self.get_area_cost_lists(room_surface_list)
+            room_option_list = []
+            option_values = []
+            option_costs = []
+            for selection in knapsack.get_efficient_selections(min(budget, sum(room_costs)), room_values,
+                                                                room_costs):
+                option_value = sum(room_values[i] for i in selection)
+                if len(selection) < len(room_surface_list):
+                    option_value -= partial_room_penalty
+                if option_value > 0:
+                    room_option_list.append([room_surface_list[i] for i in selection])
+                    option_values.append(option_value)
+                    option_costs.append(sum(room_costs[i] for i in selection))
+            room_option_lists.append(room_option_list)
+            values.append(option_values)
+            costs.append(option_costs)
+
+        chosen_options = knapsack.multiple_choice_knapsack(budget, values, costs)
+        budgeted_painting_surface_list = []
+        for room_option_list, option in zip(room_option_lists, chosen_options):
+            if option is not None:
+                budgeted_painting_surface_list += room_option_list[option]
+        original_painting_surface_list = self.get_painting_surface_list_from_room_list(sorted_room_list)
+        return OptimisedJob(budgeted_painting_surface_list, original_painting_surface_list, budget, solver='grouped')
+
+    # Method to optimise the job when surfaces painted with the same paint share its tins, so the paint is paid for by
+    # rounding the total units of each paint up to whole tins instead of charging each surface for part of a tin. The
+    # cost of a surface then depends on the other surfaces sharing its paint, so this optimisation is a heuristic and
+    # does not always find the best choice. It starts from the best choices when each surface pays for its own part
+    # of a tin, improves each by local search and keeps the one with the most area. Returns an optimised job with the
+    # list of tins to buy.
+    def get_optimised_tin_job(self, budget):
+        surface_list = self.get_painting_surface_list()
+        optimal_surface_list = max((improve_shared_tin_choice(budget, surface_list, seed_surface_list)
+                                    for seed_surface_list in get_shared_tin_seeds(budget, surface_list)),
+                                   key=lambda choice: sum(painting_surface.surface.area for painting_surface in choice))
+        return OptimisedJob(optimal_surface_list, surface_list, budget, solver='shared_tin',
+                            purchasing_list=get_purchasing_list(optimal_surface_list))
+
+    # Method to plan a job which is paid for over several phases, each with its own budget. The surfaces, or whole rooms
+    # when by_rooms is True, are assigned to the phases to paint the most area over all the phases. Small jobs are
+    # planned exactly and large ones by filling each phase in turn with the best choice of what is left. Costs are
+    # rounded up to whole pounds. Returns a list with an optimised job for each phase, whose original list is what was
+    # still unpainted at the start of the phase, and the list of painting surfaces left over after the last phase.
+    def plan_phases(self, budgets, by_rooms=False):
+        for budget in budgets:
+            assert isinstance(budget, int) and budget >= 0, 'Input "budgets" needs to be a list of whole numbers ' \
+                                                             'greater than or equal to zero'
+        if by_rooms:
+            item_list = self.get_sorted_room_list()
+            values = self.get_room_surface_area_list(item_list)
+            costs = self.get_room_price_list(item_list)
+        else:
+            item_list = self.get_painting_surface_list()
+            values, costs = self.get_area_cost_lists(item_list)
+        assigned_phases, exact = knapsack.multiple_knapsack(budgets, values, costs)
+        solver = 'exact_multiple' if exact else 'sequential_multiple'
+
+        optimised_job_list = []
+        remaining_item_list = item_list
+        for phase, budget in enumerate(budgets):
+            phase_item_list = [item for item, assigned_phase in zip(item_list, assigned_phases)
+                               if assigned_phase == phase]
+            if by_rooms:
+                budgeted_painting_surface_list = self.get_painting_surface_list_from_room_list(phase_item_list)
+                original_painting_surface_list = self.get_painting_surface_list_from_room_list(remaining_item_list)
+            else:
+                budgeted_painting_surface_list = phase_item_list
+                original_painting_surface_list = remaining_item_list
+            optimised_job_list.append(OptimisedJob(budgeted_painting_surface_list, original_painting_surface_list,
+                                                   budget, solver=solver))
+            remaining_item_list = [item for item in remaining_item_list if item not in phase_item_list]
+
+        if by_rooms:
+            return optimised_job_list, self.get_painting_surface_list_from_room_list(remaining_item_list)
+        return optimised_job_list, remaining_item_list
+
+    # Method to solve the surface optimisation once for every budget up to a maximum budget, returns a budget frontier
+    # object which gives the best area for each budget and rebuilds the surfaces for any of them without solving again
+    def get_budget_frontier(self, max_budget):
+        surface_list = self.get_painting_surface_list()
+        values, costs = self.get_area_cost_lists(surface_list)
+        return BudgetFrontier(surface_list, values, costs, max_budget)
+
+    # Method to find every trade-off between the total area and the area in poor condition, or in the conditions of the
+    # condition list, painted by whole rooms for every budget up to a maximum budget, returns an area condition frontier
+    def get_area_condition_frontier(self, max_budget, condition_list=None):
+        if condition_list is None:
+            condition_list = ['poor']
+        sorted_room_list = self.get_sorted_room_list()
+        total_areas = self.get_room_surface_area_list(sorted_room_list)
+        condition_areas = self.get_room_surface_area_by_condition_list(sorted_room_list, condition_list)
+        costs = self.get_room_price_list(sorted_room_list)
+        return AreaConditionFrontier(sorted_room_list, total_areas, condition_areas, costs, max_budget)
+
+    # Method to run several optimisations of the job at once, each in its own process, and return their summaries side
+    # by side as a dictionary from the name of each optimisation to its summary. The optimisers are a dictionary from
+    # names to functions taking the job and the budget, such as OPTIMISATION_TYPE_TO_OPTIMISER in forms, and default to
+    # the surfaces, rooms and condition optimisations. Every worker gets its own copy of the job, so the optimisations
+    # take about as long as the slowest one. Every surface is priced once before the job is copied, and the cached
+    # prices go with the copies so the workers share them instead of each pricing the surfaces again.
+    def compare_optimisations(self, budget, optimisers=None):
+        if optimisers is None:
+            optimisers = JOB_OPTIMISERS
+        self.get_totals()
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max(len(optimisers), 1)) as executor:
+            futures = {name: executor.submit(get_optimised_job_summary, optimiser, self, budget)
+                       for name, optimiser in optimisers.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+    # Method to plan the cheapest tins of paint to buy for the whole job from a catalogue of tin sizes and prices
+    def get_tin_purchase_plan(self, tin_catalogue=None):
+        return get_tin_purchase_plan(self.get_painting_surface_list(), tin_catalogue)
+
+    # Method to create a job frame holding the properties of every painting surface of the job in columns, in the
+    # order of the rooms and of the surfaces in each room, for pricing the whole job at once
+    def get_job_frame(self):
+        columns = {name: [] for name in JOB_FRAME_COLUMNS}
+        surface_names = []
+        for room_index, room in enumerate(self.rooms):
+            for painting_surface in room.painting_surfaces:
+                surface = painting_surface.surface
+                columns['area'].append(surface.area)
+                columns['labour_price_msq'].append(painting_surface.labour_price_msq)
+                columns['labour_adjustment'].append(surface.labour_adjustment)
+                columns['num_coats'].append(surface.substrate.num_coats)
+                columns['preparation_factor'].append(surface.substrate.preparation_factor)
+                columns['coverage_adjustment'].append(surface.substrate.coverage_adjustment)
+                columns['paint_price'].append(painting_surface.paint.price)
+                columns['paint_unit'].append(painting_surface.paint.unit)
+                columns['paint_coverage'].append(painting_surface.paint.coverage)
+                columns['room_index'].append(room_index)
+                surface_names.append(surface.name)
+        return JobFrame(columns, [room.name for room in self.rooms], surface_names)
+
+    # Method to return the persistent optimiser attached to the job, a new one is created when there is none yet or
+    # when a different maximum budget is asked for. Surfaces should be added, removed or replaced through the
+    # optimiser so that only the part of the optimisation affected by the edit is recomputed.
+    def get_optimiser(self, max_budget):
+        if self.optimiser is None or self.optimiser.max_budget != max_budget:
+            self.optimiser = JobOptimiser(self, max_budget)
+        return self.optimiser
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------- Optimisation helpers -----------------------------------------------------
+
+# Dictionary of the optimisations compared by default by Job.compare_optimisations
+JOB_OPTIMISERS = {
+    'Max surface area': Job.get_optimised_job,
+    'Max rooms by surface area': Job.get_optimised_rooms_job,
+    'Max rooms by condition and surface area': Job.get_optimised_condition_job,
+}
+
+
+# Function run in each worker process of Job.compare_optimisations to optimise the job and summarise the result
+def get_optimised_job_summary(optimiser, job, budget):
+    return optimiser(job, budget).get_summary()
+
+
+# Function to pick a solver and run the reduction and the solver for the Job optimisers. The prices are the exact
+# prices of the items, they are rounded up to whole pounds to pick the solver and then to the cost units the solver
+# works in. A solver name from knapsack.KNAPSACK_SOLVERS can be given to override the automatic choice. The items at
+# the must include positions are paid for out of the budget first and the items at the exclude positions are dropped,
+# so only the rest of the items are optimised with what is left of the budget. Returns the optimal index list and a
+# dictionary of information about the optimisation to pass on to the optimised job, when an epsilon is given this
+# includes the epsilon and the proven upper bound on the best possible value.
+def get_optimal_index_list(budget, values, prices, solver=None, epsilon=None, must_include_index_list=(),
+                           exclude_index_list=()):
+    free_budget, free_index_list = get_free_index_list(budget, prices, must_include_index_list, exclude_index_list)
+    must_include_value = sum(values[i] for i in set(must_include_index_list))
+    free_values = [values[i] for i in free_index_list]
+    free_prices = [prices[i] for i in free_index_list]
+
+    costs = [get_scaled_cost(price, 1) for price in free_prices]
+    solver = knapsack.select_solver(get_capacity(free_budget, 1), costs, solver, epsilon)
+    cost_scale = knapsack.KNAPSACK_SOLVERS[solver]['cost_scale']
+    if cost_scale != 1:
+        costs = [get_scaled_cost(price, cost_scale) for price in free_prices]
+    capacity = get_capacity(free_budget, cost_scale)
+
+    solver_kwargs = dict()
+    if epsilon is not None and not knapsack.KNAPSACK_SOLVERS[solver]['exact']:
+        solver_kwargs['epsilon'] = epsilon
+    free_optimal_index_list, reduction_statistics = knapsack.cached_reduced_knapsack(capacity, free_values, costs,
+                                                                                     solver, **solver_kwargs)
+    optimal_index_list = [free_index_list[i] for i in free_optimal_index_list] + list(set(must_include_index_list))
+    optimal_index_list.sort(reverse=True)
+    if epsilon is None:
+        return optimal_index_list, dict(solver=solver, reduction_statistics=reduction_statistics)
+
+    upper_bound = must_include_value + knapsack.get_fptas_upper_bound(capacity, free_values, costs,
+                                                                      free_optimal_index_list, epsilon)
+    return optimal_index_list, dict(solver=solver, reduction_statistics=reduction_statistics, epsilon=epsilon,
+                                    optimal_area_upper_bound=upper_bound)
+
+
+# Function to find the k best distinct index lists for the Job optimisers with one solve of the top k knapsack, in
+# whole pounds. The must include and exclude positions are handled as in the function above. Returns the index lists
+# best first.
+def get_top_k_index_lists(budget, values, prices, k, must_include_index_list=(), exclude_index_list=()):
+    free_budget, free_index_list = get_free_index_list(budget, prices, must_include_index_list, exclude_index_list)
+    free_values = [values[i] for i in free_index_list]
+    costs = [get_scaled_cost(prices[i], 1) for i in free_index_list]
+    top_k_index_lists = []
+    for free_optimal_index_list in knapsack.top_k_knapsack(get_capacity(free_budget, 1), free_values, costs, k):
+        optimal_index_list = [free_index_list[i] for i in free_optimal_index_list] + list(set(must_include_index_list))
+        top_k_index_lists.append(sorted(optimal_index_list, reverse=True))
+    return top_k_index_lists
+
+
+# Function to check the must include and exclude positions of the items and charge the must include items against the
+# budget. Returns what is left of the budget and the positions of the items which are free to be optimised.
+def get_free_index_list(budget, prices, must_include_index_list, exclude_index_list):
+    must_include_index_set = set(must_include_index_list)
+    exclude_index_set = set(exclude_index_list)
+    assert not must_include_index_set & exclude_index_set, 'An item cannot be in both "must_include" and "exclude"'
+    must_include_price = sum(prices[i] for i in must_include_index_set)
+    assert must_include_price <= budget, 'The items in "must_include" cost more than the budget'
+    constrained_index_set = must_include_index_set | exclude_index_set
+    free_index_list = [i for i in range(len(prices)) if i not in constrained_index_set]
+    return budget - must_include_price, free_index_list
+
+
+# Function to find the whole number of cost units which can be spent from a budget, the budget is first rounded to
+# remove floating point noise as in the function below
+def get_capacity(budget, cost_scale):
+    return math.floor(round(budget * cost_scale, 6))
+
+
+# Function to find which painting surfaces can share tins, surfaces painted with paints of the same class, price, unit
+# and coverage share tins
+def get_paint_key(paint):
+    return type(paint).__name__, paint.price, paint.unit, paint.coverage
+
+
+# Function to add up the units of paint of the painting surfaces sharing each paint, returns a dictionary from each
+# paint key to the paint and its total units of paint, in order of first use
+def get_paint_units_dict(painting_surface_list):
+    paint_units_dict = dict()
+    for painting_surface in painting_surface_list:
+        paint_key = get_paint_key(painting_surface.paint)
+        paint, units_of_paint = paint_units_dict.get(paint_key, (painting_surface.paint, 0))
+        paint_units_dict[paint_key] = (paint, units_of_paint + painting_surface.get_units_of_paint())
+    return paint_units_dict
+
+
+# Number of starting choices the local search of the shared tin optimisation is run from
+NUM_SHARED_TIN_SEEDS = 8
+
+
+# Function to find the starting choices of surfaces for the shared tin optimisation with one knapsack over the prices of
+# the surfaces paying for their own part of a tin, in whole pounds. Whole tins cost at least as much as parts of tins,
+# so the best choice at each budget is tried from the top down and the first choices whose whole tins fit in the
+# budget are kept.
+def get_shared_tin_seeds(budget, surface_list):
+    values, costs = Job.get_area_cost_lists(surface_list)
+    capacity = get_capacity(budget, 1)
+    best_value_list, decisions = knapsack.get_decision_table(capacity, values, costs)
+    seed_set = set()
+    seeds = []
+    for seed_budget in range(capacity, 0, -1):
+        selection = tuple(knapsack.backtrack_decision_table(decisions, costs, seed_budget))
+        if selection in seed_set:
+            continue
+        seed_set.add(selection)
+        seed_surface_list = [surface_list[i] for i in selection]
+        if get_shared_tin_price(seed_surface_list) <= budget:
+            seeds.append(seed_surface_list)
+            if len(seeds) == NUM_SHARED_TIN_SEEDS:
+                break
+    return seeds or [[]]
+
+
+# Function to improve a choice of surfaces for the shared tin optimisation by local search. Each step makes the move
+# which adds the most area, either adding a surface or swapping a chosen surface for a bigger one, while the labour and
+# the whole tins of every paint still fit in the budget. The labour and the units of each paint are kept as running
+# totals so a move is priced without adding up the whole choice again. Stops when no move adds any area.
+def improve_shared_tin_choice(budget, surface_list, chosen_surface_list):
+    labour_price_list = [painting_surface.get_labour_price() for painting_surface in surface_list]
+    units_of_paint_list = [painting_surface.get_units_of_paint() for painting_surface in surface_list]
+    area_list = [painting_surface.surface.area for painting_surface in surface_list]
+    paint_key_list = [get_paint_key(painting_surface.paint) for painting_surface in surface_list]
+    tin_price_dict = {paint_key: painting_surface.paint.price
+                      for paint_key, painting_surface in zip(paint_key_list, surface_list)}
+
+    chosen_id_set = {id(painting_surface) for painting_surface in chosen_surface_list}
+    chosen_index_set = {i for i, painting_surface in enumerate(surface_list) if id(painting_surface) in chosen_id_set}
+    paint_units_dict = dict.fromkeys(tin_price_dict, 0)
+    for i in chosen_index_set:
+        paint_units_dict[paint_key_list[i]] += units_of_paint_list[i]
+    price = sum(labour_price_list[i] for i in chosen_index_set)
+    for paint_key, units_of_paint in paint_units_dict.items():
+        price += get_num_tins(units_of_paint) * tin_price_dict[paint_key]
+
+    # pricing the choice after taking out surface i, when i is not None, and putting in surface j
+    def get_move_price(i, j):
+        changed_units_dict = {paint_key_list[j]: paint_units_dict[paint_key_list[j]] + units_of_paint_list[j]}
+        move_price = price + labour_price_list[j]
+        if i is not None:
+            changed_units_dict[paint_key_list[i]] = changed_units_dict.get(
+                paint_key_list[i], paint_units_dict[paint_key_list[i]]) - units_of_paint_list[i]
+            move_price -= labour_price_list[i]
+        for paint_key, units_of_paint in changed_units_dict.items():
+            move_price += (get_num_tins(units_of_paint) - get_num_tins(paint_units_dict[paint_key])) * \
+                tin_price_dict[paint_key]
+        return move_price
+
+    while True:
+        best_move = None
+        for j in range(len(surface_list)):
+            if j in chosen_index_set:
+                continue
+            for i in [None] + [i for i in chosen_index_set if area_list[i] < area_list[j]]:
+                area_gain = area_list[j] - (0 if i is None else area_list[i])
+                if best_move is not None and area_gain <= best_move[0]:
+                    continue
+                move_price = get_move_price(i, j)
+                if round(move_price, 6) <= budget:
+                    best_move = (area_gain, i, j, move_price)
+        if best_move is None:
+            break
+        area_gain, i, j, price = best_move
+        if i is not None:
+            chosen_index_set.remove(i)
+            paint_units_dict[paint_key_list[i]] -= units_of_paint_list[i]
+        chosen_index_set.add(j)
+        paint_units_dict[paint_key_list[j]] += units_of_paint_list[j]
+    return [surface_list[i] for i in sorted(chosen_index_set)]
+
+
+# Function to round units of paint up to whole tins, the units are first rounded to remove floating point noise so that
+# exactly two tins of paint are not bought as three
+def get_num_tins(units_of_paint):
+    return math.ceil(round(units_of_paint, 9))
+
+
+# Function to list the tins of each paint to buy for a list of painting surfaces as a list of dictionaries
+def get_purchasing_list(painting_surface_list):
+    purchasing_list = []
+    for paint_key, (paint, units_of_paint) in get_paint_units_dict(painting_surface_list).items():
+        num_tins = get_num_tins(units_of_paint)
+        purchasing_list.append(dict(
+            paint=paint_key[0],
+            unit=paint.unit,
+            tin_price=paint.price,
+            units_of_paint=round(units_of_paint, 2),
+            num_tins=num_tins,
+            total_price=round(num_tins * paint.price, 2),
+        ))
+    return purchasing_list
+
+
+# Function to total the price of a list of painting surfaces when surfaces sharing a paint share its tins, the labour
+# of each surface is added to the price of the whole tins of each paint
+def get_shared_tin_price(painting_surface_list):
+    labour_price = sum(painting_surface.get_labour_price() for painting_surface in painting_surface_list)
+    paint_price = sum(get_num_tins(units_of_paint) * paint.price
+                      for paint, units_of_paint in get_paint_units_dict(painting_surface_list).values())
+    return labour_price + paint_price
+
+
+# Function to plan the cheapest tins to buy for the paint of a list of painting surfaces. The tin catalogue maps the
+# name of a paint class to a dictionary of the tin sizes in litres and their prices, a paint missing from the catalogue
+# is bought in its own tin size at its own price. The litres of each paint are added up over the surfaces sharing the
+# paint and covered in whole millilitres, the litres needed are rounded up and the tin sizes are rounded down so the
+# tins planned always hold at least the paint needed. Returns a list of dictionaries in order of first use.
+def get_tin_purchase_plan(painting_surface_list, tin_catalogue=None):
+    if tin_catalogue is None:
+        tin_catalogue = dict()
+    tin_purchase_plan = []
+    for paint_key, (paint, units_of_paint) in get_paint_units_dict(painting_surface_list).items():
+        tin_price_dict = tin_catalogue.get(paint_key[0], {paint.unit: paint.price})
+        tin_sizes = list(tin_price_dict)
+        litres = units_of_paint * paint.unit
+        counts = knapsack.min_cost_cover(get_scaled_cost(litres, 1000), [math.floor(round(tin_size * 1000, 6))
+                                                                         for tin_size in tin_sizes],
+                                         list(tin_price_dict.values()))
+        tin_purchase_plan.append(dict(
+            paint=paint_key[0],
+            litres=round(litres, 2),
+            tins={tin_size: count for tin_size, count in zip(tin_sizes, counts) if count},
+            total_price=round(sum(count * tin_price_dict[tin_size] for tin_size, count in zip(tin_sizes, counts)), 2),
+        ))
+    return tin_purchase_plan
+
+
+# Function to find the type of a paint class, which is the class directly below Paint such as EmulsionPaint or
+# OilPaint, returns None for the Paint class itself
+def get_paint_type(paint_class):
+    for cls in paint_class.__mro__:
+        if Paint in cls.__bases__:
+            return cls
+    return None
+
+
+# Function to round a price up to a whole number of cost units, the price is first rounded to remove floating point
+# noise so that a price such as 1.1 becomes 110 pence and not 111
+def get_scaled_cost(price, cost_scale):
+    return math.ceil(round(price * cost_scale, 6))
 
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -792,12 +1532,25 @@ class Job:
 # returns summary dictionaries to view and compare results
 
 class OptimisedJob:
-    # takes in the un-optimised list, the optimised list and the budget that the job was optimised to as arguments
-    def __init__(self, budgeted_painting_surface_list, original_painting_surface_list, budget):
+    # takes in the un-optimised list, the optimised list and the budget that the job was optimised to as arguments,
+    # optionally with the name of the knapsack solver which was used, the statistics of the problem reduction which
+    # was run before the optimisation and, when an epsilon was given, the epsilon and the proven upper bound on the best
+    # area which could be optimised. When the paints were picked by the optimisation the paint chosen for each budgeted
+    # surface is recorded in the paint choices list. When surfaces sharing a paint share its tins the list of tins to
+    # buy is kept as the purchasing list.
+    def __init__(self, budgeted_painting_surface_list, original_painting_surface_list, budget, solver=None,
+                 reduction_statistics=None, epsilon=None, optimal_area_upper_bound=None, paint_choices=None,
+                 purchasing_list=None):
 # Sorting the budgeted painting surface list by room name property so for summary info surfaces are grouped in rooms
         self.budgeted_painting_surface_list = sorted(budgeted_painting_surface_list, key=lambda x: x.surface.room_name)
         self.original_painting_surface_list = original_painting_surface_list
         self.budget = budget
+        self.solver = solver
+        self.reduction_statistics = reduction_statistics
+        self.epsilon = epsilon
+        self.optimal_area_upper_bound = optimal_area_upper_bound
+        self.paint_choices = paint_choices
+        self.purchasing_list = purchasing_list
 
     # method to provide a breakdown of the budgeted painting surface list using the get breakdown method from each
     # painting surface class and adding the breakdowns to a list
@@ -805,9 +1558,16 @@ class OptimisedJob:
         breakdown_list = []
         for painting_surface in self.budgeted_painting_surface_list:
             breakdown_dict = painting_surface.get_breakdown()
+            # showing which paint was picked when the optimisation chose the paints
+            if self.paint_choices is not None:
+                breakdown_dict['paint'] = type(painting_surface.paint).__name__
             breakdown_list.append(breakdown_dict)
         return breakdown_list
 
+    # Method to total the prices and surface areas of the budgeted painting surfaces in a single pass
+    def get_totals(self):
+        return get_surface_list_totals(self.budgeted_painting_surface_list)
+
     # Method to summarise the original list and the budgeted list and combine into a final dictionary of useful info
     def get_summary(self):
         summary_dict_original_job = self.get_surface_list_summary_statistics(self.original_painting_surface_list)
@@ -824,22 +1584,265 @@ class OptimisedJob:
             cost_for_remaining_items=round(
                 summary_dict_original_job['total_price']-summary_dict_budgeted_job['total_price'], 2)
         )
+        # recording the accuracy of an approximate optimisation
+        if self.epsilon is not None:
+            final_summary_dict['epsilon'] = self.epsilon
+            final_summary_dict['optimal_area_upper_bound'] = round(self.optimal_area_upper_bound, 2)
+        # recording the price paying for whole tins of paint shared between surfaces
+        if self.purchasing_list is not None:
+            final_summary_dict['total_shared_tin_price'] = round(
+                get_shared_tin_price(self.budgeted_painting_surface_list), 2)
         return final_summary_dict
 
     #Method which is given the original list and budgeted list separately to summarise
     @staticmethod
     def get_surface_list_summary_statistics(surface_list):
-        total_price = 0
-        total_surface_area = 0
-        for painting_surface in surface_list:
-            total_price += painting_surface.get_total_price()
-            total_surface_area += painting_surface.surface.area
+        totals = get_surface_list_totals(surface_list)
         return dict(
-            total_price=total_price,
-            total_surface_area=total_surface_area,
+            total_price=totals['total_price'],
+            total_surface_area=totals['surface_area'],
         )
 
 
+# ----------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------ Budget Frontier -----------------------------------------------------
+
+# The budget frontier class is instantiated from a job and holds the last row of the knapsack, the best area for every
+# whole pound budget up to the maximum budget, together with the bit-packed decision table. Any budget up to the
+# maximum can then be answered and its surfaces rebuilt without solving the optimisation again.
+
+class BudgetFrontier:
+    # takes in the painting surface list sorted for the knapsack with its area and cost lists and the maximum budget
+    def __init__(self, painting_surface_list, values, costs, max_budget):
+        assert isinstance(max_budget, int) and max_budget >= 0, 'Input "max_budget" needs to be a non-negative integer'
+        self.painting_surface_list = painting_surface_list
+        self.costs = costs
+        self.max_budget = max_budget
+        self.best_area_list, self.decisions = knapsack.get_decision_table(max_budget, values, costs)
+
+    # Method to return the best area which can be painted for a budget
+    def get_best_area(self, budget):
+        assert 0 <= budget <= self.max_budget, 'Input "budget" needs to be between 0 and the maximum budget'
+        return self.best_area_list[int(budget)]
+
+    # Method to return the area against budget curve as a list of (budget, area) tuples, only the budgets where the
+    # best area increases are included
+    def get_breakpoints(self):
+        breakpoints = [(0, self.best_area_list[0])]
+        for budget in range(1, self.max_budget + 1):
+            if self.best_area_list[budget] != self.best_area_list[budget - 1]:
+                breakpoints.append((budget, self.best_area_list[budget]))
+        return breakpoints
+
+    # Method to return a list of (budget, extra area) tuples for every step of budget, showing what each extra step of
+    # budget buys
+    def get_marginal_area_list(self, step=100):
+        assert isinstance(step, int) and step > 0, 'Input "step" needs to be a positive integer'
+        marginal_area_list = []
+        for budget in range(step, self.max_budget + 1, step):
+            marginal_area_list.append((budget, self.best_area_list[budget] - self.best_area_list[budget - step]))
+        return marginal_area_list
+
+    # Method to rebuild the optimised job for any budget up to the maximum by backtracking the decision table
+    def get_optimised_job(self, budget):
+        assert 0 <= budget <= self.max_budget, 'Input "budget" needs to be between 0 and the maximum budget'
+        optimal_index_list = knapsack.backtrack_decision_table(self.decisions, self.costs, int(budget))
+        optimal_surface_list = [self.painting_surface_list[i] for i in optimal_index_list]
+        return OptimisedJob(optimal_surface_list, self.painting_surface_list, budget)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# -------------------------------------------- Area Condition Frontier -------------------------------------------------
+
+# The area condition frontier class holds every trade-off between the total area and the area in the chosen conditions
+# painted by whole rooms, for every budget up to a maximum, from one pass over the rooms. It replaces solving the rooms
+# and the condition optimisations separately for each budget to compare them.
+
+class AreaConditionFrontier:
+    # takes in the sorted room list with the total area, condition area and cost lists and the maximum budget
+    def __init__(self, sorted_room_list, total_areas, condition_areas, costs, max_budget):
+        assert isinstance(max_budget, int) and max_budget >= 0, 'Input "max_budget" needs to be a non-negative integer'
+        self.sorted_room_list = sorted_room_list
+        self.max_budget = max_budget
+        self.frontiers = knapsack.get_bi_objective_frontiers(max_budget, total_areas, condition_areas, costs)
+
+    # Method to return the best trade-offs for a budget as a list of (total area, condition area) tuples, from the most
+    # total area to the most condition area, no trade-off on the list is beaten in both areas by another choice of rooms
+    def get_pareto_set(self, budget):
+        assert 0 <= budget <= self.max_budget, 'Input "budget" needs to be between 0 and the maximum budget'
+        frontier = self.frontiers[-1]
+        return [frontier[j][1] for j in knapsack.get_bi_objective_pareto_set(frontier, budget)]
+
+    # Method to return an optimised job for each of the best trade-offs for a budget, in the order of the pareto set
+    def get_optimised_job_list(self, budget):
+        assert 0 <= budget <= self.max_budget, 'Input "budget" needs to be between 0 and the maximum budget'
+        original_painting_surface_list = Job.get_painting_surface_list_from_room_list(self.sorted_room_list)
+        optimised_job_list = []
+        for position in knapsack.get_bi_objective_pareto_set(self.frontiers[-1], budget):
+            optimal_room_index_list = knapsack.backtrack_pareto_frontiers(self.frontiers, position)
+            optimal_room_list = [self.sorted_room_list[i] for i in optimal_room_index_list]
+            budgeted_painting_surface_list = Job.get_painting_surface_list_from_room_list(optimal_room_list)
+            optimised_job_list.append(OptimisedJob(budgeted_painting_surface_list, original_painting_surface_list,
+                                                   budget))
+        return optimised_job_list
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------- Job Optimiser ------------------------------------------------------
+
+# The job optimiser class is attached to a job and keeps an incremental knapsack over the painting surfaces of the job.
+# Adding a surface only computes one new row of the knapsack, and removing, replacing or re-pricing a surface only
+# recomputes the rows after it, so re-optimising after a small edit costs a fraction of a full solve.
+
+class JobOptimiser:
+    def __init__(self, job, max_budget):
+        assert isinstance(job, Job), 'Input needs to be a Job object'
+        self.job = job
+        self.max_budget = max_budget
+        self.painting_surface_list = job.get_painting_surface_list()
+        values, costs = Job.get_area_cost_lists(self.painting_surface_list)
+        self.knapsack = knapsack.IncrementalKnapsack(max_budget, values, costs)
+
+    # Method to find the position of a painting surface in the optimiser, painting surfaces are compared by identity
+    def get_index(self, painting_surface):
+        for index, other_painting_surface in enumerate(self.painting_surface_list):
+            if other_painting_surface is painting_surface:
+                return index
+        raise AssertionError('Input needs to be a painting surface in the job')
+
+    # Method to find the room of the job which holds a painting surface
+    def get_room(self, painting_surface):
+        for room in self.job.rooms:
+            for other_painting_surface in room.painting_surfaces:
+                if other_painting_surface is painting_surface:
+                    return room
+        raise AssertionError('Input needs to be a painting surface in the job')
+
+    # Method to add a painting surface to a room of the job and to the end of the optimisation
+    def add_surface(self, room, painting_surface):
+        assert isinstance(painting_surface, PaintingSurface), 'Input needs to be a painting surface object'
+        room.painting_surfaces.append(painting_surface)
+        painting_surface.surface.room_name = room.name
+        values, costs = Job.get_area_cost_lists([painting_surface])
+        self.painting_surface_list.append(painting_surface)
+        self.knapsack.append(values[0], costs[0])
+
+    # Method to remove a painting surface from its room and from the optimisation
+    def remove_surface(self, painting_surface):
+        index = self.get_index(painting_surface)
+        room = self.get_room(painting_surface)
+        room.painting_surfaces = [x for x in room.painting_surfaces if x is not painting_surface]
+        del self.painting_surface_list[index]
+        self.knapsack.remove(index)
+
+    # Method to replace a painting surface in its room and in the optimisation with a new painting surface
+    def replace_surface(self, painting_surface, new_painting_surface):
+        assert isinstance(new_painting_surface, PaintingSurface), 'Input needs to be a painting surface object'
+        index = self.get_index(painting_surface)
+        room = self.get_room(painting_surface)
+        room.painting_surfaces = [new_painting_surface if x is painting_surface else x for x in room.painting_surfaces]
+        new_painting_surface.surface.room_name = room.name
+        self.painting_surface_list[index] = new_painting_surface
+        self.update_surface(new_painting_surface)
+
+    # Method to re-price a painting surface which has been edited in place, for example a new area or paint
+    def update_surface(self, painting_surface):
+        index = self.get_index(painting_surface)
+        values, costs = Job.get_area_cost_lists([painting_surface])
+        self.knapsack.replace(index, values[0], costs[0])
+
+    # Method to return the optimised job for any budget up to the maximum budget
+    def get_optimised_job(self, budget):
+        assert 0 <= budget <= self.max_budget, 'Input "budget" needs to be between 0 and the maximum budget'
+        optimal_index_list = self.knapsack.get_included_items(int(budget))
+        optimal_surface_list = [self.painting_surface_list[i] for i in optimal_index_list]
+        return OptimisedJob(optimal_surface_list, list(self.painting_surface_list), budget)
+
+    # Method to return the best area which could be painted for a budget if a painting surface was left out
+    def get_best_area_without(self, painting_surface, budget):
+        assert 0 <= budget <= self.max_budget, 'Input "budget" needs to be between 0 and the maximum budget'
+        return self.knapsack.get_best_value_without(self.get_index(painting_surface), int(budget))
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# --------------------------------------------------- Job Frame --------------------------------------------------------
+
+# The job frame class holds the properties of every painting surface of a job in columns of NumPy arrays, one entry per
+# surface, so a whole job is priced with a few array operations instead of one painting surface at a time. The prices
+# are worked out in the same order of operations as the painting surface so they match its breakdown to the penny.
+
+# Names of the columns of a job frame
+JOB_FRAME_COLUMNS = ('area', 'labour_price_msq', 'labour_adjustment', 'num_coats', 'preparation_factor',
+                     'coverage_adjustment', 'paint_price', 'paint_unit', 'paint_coverage', 'room_index')
+
+
+class JobFrame:
+    # takes in a dictionary of the columns, the names of the rooms in order of room index and the name of each surface
+    def __init__(self, columns, room_names, surface_names):
+        assert np is not None, 'The job frame needs NumPy to be installed'
+        assert set(columns) == set(JOB_FRAME_COLUMNS), 'Input "columns" needs to have the columns ' + \
+                                                        ', '.join(JOB_FRAME_COLUMNS)
+        self.columns = {name: np.asarray(columns[name], dtype=np.int64 if name == 'room_index' else np.float64)
+                        for name in JOB_FRAME_COLUMNS}
+        self.room_names = room_names
+        self.surface_names = surface_names
+        self.price_arrays = None
+
+    # Method to return the number of painting surfaces in the frame
+    def __len__(self):
+        return len(self.columns['area'])
+
+    # Method to work out the labour price, units of paint, paint price and total price of every surface, the arrays
+    # are kept so the job is only priced once
+    def get_price_arrays(self):
+        if self.price_arrays is None:
+            c = self.columns
+            total_paint_coverage = np.trunc(c['paint_coverage'] * c['paint_unit'])
+            units_of_paint = (c['area'] / (total_paint_coverage / c['coverage_adjustment'])) * c['num_coats']
+            paint_price = units_of_paint * c['paint_price']
+            labour_price = c['area'] * c['labour_price_msq'] * c['labour_adjustment'] * c['num_coats'] * \
+                c['preparation_factor']
+            self.price_arrays = dict(
+                labour_price=labour_price,
+                units_of_paint=units_of_paint,
+                paint_price=paint_price,
+                total_price=labour_price + paint_price,
+            )
+        return self.price_arrays
+
+    # Method to total the prices and areas of the surfaces of each room by summing the arrays segmented by room index,
+    # returns a dictionary of arrays with one entry per room
+    def get_room_totals(self):
+        room_totals = dict()
+        room_index = self.columns['room_index']
+        for name, price_array in self.get_price_arrays().items():
+            room_totals[name] = np.bincount(room_index, weights=price_array, minlength=len(self.room_names))
+        room_totals['surface_area'] = np.bincount(room_index, weights=self.columns['area'],
+                                                  minlength=len(self.room_names))
+        return room_totals
+
+    # Method to total the price of the whole job
+    def get_total_price(self):
+        return float(self.get_price_arrays()['total_price'].sum())
+
+    # Method to create the same breakdown as the job, a list of the breakdown lists of each room with a dictionary
+    # for each painting surface, rounding each price as the painting surface does
+    def get_breakdown(self):
+        price_lists = {name: price_array.tolist() for name, price_array in self.get_price_arrays().items()}
+        area_list = self.columns['area'].tolist()
+        breakdown_list = [[] for room_name in self.room_names]
+        for i, room_index in enumerate(self.columns['room_index'].tolist()):
+            breakdown_list[room_index].append(dict(
+                room_name=self.room_names[room_index],
+                surface_name=self.surface_names[i],
+                total_price=round(price_lists['total_price'][i], 2),
+                labour_price=round(price_lists['labour_price'][i], 2),
+                paint_price=round(price_lists['paint_price'][i], 2),
+                units_of_paint=round(price_lists['units_of_paint'][i], 2),
+                surface_area=area_list[i],
+            ))
+        return breakdown_list
+
 
 # ----------------------------------------------------------------------------------------------------------------------
 # -------------------------------------------------- Other things ------------------------------------------------------
@@ -848,21 +1851,18 @@ class OptimisedJob:
 # incorporated to display these description when a user wishes to understand the definition of the condition assumptions
 
 class ConditionAssumptions():
-    def __init__(self):
-        poor = '''Poor condition is where lots of preparation is required. Surfaces exhibit cracking, gaps not filled,
+    __slots__ = ()
+    # The descriptions are class constants so every instance shares the same strings
+    poor = '''Poor condition is where lots of preparation is required. Surfaces exhibit cracking, gaps not filled,
         previously poorly painted with drips, fibres or flaking in the surface paint. Stains from oil or water may be 
         present. There may be joinings of the paper which is painted which requite sticking back. If any of the above
         or multiple faults then condition is poor'''
-        okay = '''Okay condition is where there are some faults with the surface and a small amount of preparation is 
+    okay = '''Okay condition is where there are some faults with the surface and a small amount of preparation is 
         required, the surface may be marked and old but it sound, there may be a few fine cracks or small gaps to 
         fill'''
-        good = '''Good condition is where there is almost no preparation required, a light sand, limited fine cracks in
+    good = '''Good condition is where there is almost no preparation required, a light sand, limited fine cracks in
          corners but otherwise a good smooth surface which you are happy with'''
 
-        self.poor = poor
-        self.okay = okay
-        self.good = good
-
     def get_condition_assumption(self, condition):
         if condition == 'poor':
             return 'poor_example.jpg'
@@ -878,3 +1878,7 @@ class ConditionAssumptions():
             return self.good
 
 
+
+
+# One set of condition assumptions shared by every substrate
+CONDITION_ASSUMPTIONS = ConditionAssumptions()
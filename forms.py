@@ -2,6 +2,7 @@ import ipywidgets as widgets
 import core
 import tab_structure
 import base64
+import functools
 
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -46,9 +47,10 @@ PAINT_TYPE_TO_FINISH_OPTIONS_DICT = {
 }
 
 OPTIMISATION_TYPE_TO_OPTIMISER = {
-    'Max surface area': core.Job.get_optimised_job,
-    'Max rooms by surface area': core.Job.get_optimised_rooms_job,
-    'Max rooms by condition and surface area': core.Job.get_optimised_condition_job,
+    **core.JOB_OPTIMISERS,
+    'Max surface area preferring whole rooms': core.Job.get_optimised_grouped_job,
+    'Max surface area choosing paint finishes': functools.partial(
+        core.Job.get_optimised_paint_job, paint_catalogue=PAINT_FINISH_TYPE_TO_PAINT_CLASS_DICT),
 }
 # Dictionary of HTML paragraphs used in the GUI
 HTML_PARAGRAPH_DICT = {
@@ -877,9 +879,11 @@ class RemoteQuoteForm(widgets.VBox):
         if substrate_type == 'Custom Substrate':
             num_coats = substrate_form.input_substrate_details.input_num_coats.value
             coverage_adjustment = substrate_form.input_substrate_details.input_coverage_adjustment.value
-            substrate = core.Substrate(num_coats=num_coats, coverage_adjustment=coverage_adjustment)
+            substrate = core.get_catalogue_instance(core.Substrate, num_coats=num_coats,
+                                                    coverage_adjustment=coverage_adjustment)
         else:
-            substrate = substrate_form.substrate_input_to_substrate_class_dict[substrate_type](
+            substrate = core.get_catalogue_instance(
+                substrate_form.substrate_input_to_substrate_class_dict[substrate_type],
                 condition=substrate_form.input_condition.value)
         return substrate
 
@@ -891,9 +895,9 @@ class RemoteQuoteForm(widgets.VBox):
         paint_coverage = paint_form.paint_inputs_box.paint_coverage_input.value
         paint_class = paint_form.paint_finish_dropdown.get_paint_class_from_value()
         if paint_form.paint_type_buttons.value == 'Custom Input':
-            paint = paint_class(paint_price, paint_unit, paint_coverage)
+            paint = core.get_catalogue_instance(paint_class, paint_price, paint_unit, paint_coverage)
         else:
-            paint = paint_class()
+            paint = core.get_catalogue_instance(paint_class)
         return paint
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -1,6 +1,30 @@
 # 0/1 Knapsack optimisation algorithm implemented using Python.
+from array import array
+from collections import OrderedDict
+from numbers import Number
+import hashlib
+import logging
+import math
+import pickle
 
-def optimal_knapsack(capacity, values, costs):
+# NumPy is optional, when it is installed each row of the knapsack is computed with whole array operations
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+def optimal_knapsack(capacity, values, costs, mode='table'):
+    # The 'rolling' mode keeps two value rows and a bit-packed table of take/skip choices instead of the full matrix,
+    # it returns the same included items while using a fraction of the memory on large budgets. The 'linear' mode
+    # only ever holds a few value rows and finds the included items by divide and conquer.
+    if mode == 'rolling':
+        return rolling_knapsack(capacity, values, costs)
+    if mode == 'linear':
+        return linear_knapsack(capacity, values, costs)
+    assert mode == 'table', 'Input "mode" needs to be "table", "rolling" or "linear"'
 
     # adding 0th column to values/costs on the y axis
     values = [0] + values
@@ -40,4 +64,1083 @@ def optimal_knapsack(capacity, values, costs):
             j = j - costs[i]
         i = i - 1
 
-    return [i - 1 for i in included_items]
\ No newline at end of file
+    return [i - 1 for i in included_items]
+
+
+# Rolling row version of the knapsack, only the previous and current rows of values are held in memory and the choice
+# made for each item at each budget is recorded as a single bit so the included items can still be backtracked
+def rolling_knapsack(capacity, values, costs):
+    row, decisions = get_decision_table(capacity, values, costs)
+    return backtrack_decision_table(decisions, costs, capacity)
+
+
+# Function to fill in the value rows one item at a time, returns the last value row (the best value for every budget
+# from 0 to capacity) and a list with one bit-packed bytes object per item where bit w is set when the item is taken
+def get_decision_table(capacity, values, costs):
+    if np is not None:
+        return get_decision_table_numpy(capacity, values, costs)
+    return get_decision_table_python(capacity, values, costs)
+
+
+# Pure Python engine for the decision table, used when NumPy is not installed
+def get_decision_table_python(capacity, values, costs):
+    row = [0] * (capacity + 1)
+    decisions = []
+    for value, cost in zip(values, costs):
+        row, bits = get_next_row_python(row, value, cost)
+        decisions.append(bits)
+    return row, decisions
+
+
+# Function to compute the value row after adding one item from the row before it, returns the new row and the
+# bit-packed choices for the item. The 0th column stays at zero as in the full matrix unless fill_zero_column is set,
+# when an item costing nothing is taken at a budget of zero too.
+def get_next_row_python(row, value, cost, fill_zero_column=False):
+    capacity = len(row) - 1
+    new_row = row[:]
+    bits = bytearray((capacity >> 3) + 1)
+    start = cost if fill_zero_column else max(cost, 1)
+    for w in range(start, capacity + 1):
+        taken = value + row[w - cost]
+        # an item is only marked as taken when it strictly improves the value, matching the matrix backtrack
+        if taken > row[w]:
+            new_row[w] = taken
+            bits[w >> 3] |= 1 << (w & 7)
+    return new_row, bytes(bits)
+
+
+# Function to walk back through the bit-packed decision table from any budget up to the capacity it was built with, the
+# walk carries on at a budget of zero for tables where items costing nothing fill the 0th column
+def backtrack_decision_table(decisions, costs, budget):
+    i = len(decisions)
+    w = budget
+    included_items = []
+
+    while i > 0:
+        if decisions[i - 1][w >> 3] >> (w & 7) & 1:
+            included_items.append(i - 1)
+            w = w - costs[i - 1]
+        i = i - 1
+
+    return included_items
+
+
+# NumPy engine for the decision table, each item's row is one shifted-array maximum over the previous row so the loop
+# over every budget pound runs inside NumPy. The comparisons are the same as the Python engine so the same items are
+# chosen, integer areas are kept as integers and anything else is held as a float64 just like a Python float.
+def get_decision_table_numpy(capacity, values, costs):
+    if all(isinstance(value, int) for value in values):
+        dtype = np.int64
+    else:
+        dtype = np.float64
+    row = np.zeros(capacity + 1, dtype=dtype)
+    decisions = []
+    for value, cost in zip(values, costs):
+        row, bits = get_next_row_numpy(row, value, cost)
+        decisions.append(bits)
+    return row.tolist(), decisions
+
+
+# NumPy version of the function to compute the value row after adding one item from the row before it
+def get_next_row_numpy(row, value, cost, fill_zero_column=False):
+    capacity = len(row) - 1
+    new_row = row.copy()
+    taken = np.zeros(capacity + 1, dtype=bool)
+    start = cost if fill_zero_column else max(cost, 1)
+    if start <= capacity:
+        candidates = row[start - cost:capacity + 1 - cost] + value
+        taken[start:] = candidates > row[start:]
+        np.maximum(candidates, row[start:], out=new_row[start:])
+    return new_row, np.packbits(taken, bitorder='little').tobytes()
+
+
+# Linear memory knapsack using divide and conquer in the style of Hirschberg's algorithm. The items are split in half,
+# the best value row of the first half is computed forwards and the best value row of the second half is computed
+# backwards, and the capacity is split where the two rows add up to the most value. Each half is then solved with its
+# share of the capacity. Only O(capacity) values are held at once plus O(n) for the recursion, at the price of
+# recomputing rows O(log n) times.
+def linear_knapsack(capacity, values, costs):
+    # free items with a value are always taken, they are left out of the split because a half given none of the
+    # capacity would otherwise lose them to the zero 0th column
+    included_items = [i for i in range(len(costs)) if costs[i] == 0 and values[i] > 0]
+    index_list = [i for i in range(len(costs)) if costs[i] > 0]
+    values = [values[i] for i in index_list]
+    costs = [costs[i] for i in index_list]
+    # each task on the stack is the first item, the item after the last item and the capacity for those items
+    stack = [(0, len(costs), capacity)]
+    while stack:
+        start, end, task_capacity = stack.pop()
+        if end - start == 1:
+            if costs[start] <= task_capacity and values[start] > 0:
+                included_items.append(index_list[start])
+            continue
+        if end - start == 0 or task_capacity == 0:
+            continue
+        middle = (start + end) // 2
+        first_half_row = get_last_row(task_capacity, values[start:middle], costs[start:middle])
+        second_half_row = get_last_row(task_capacity, values[middle:end], costs[middle:end])
+        if np is not None:
+            split = int(np.argmax(first_half_row + second_half_row[::-1]))
+        else:
+            split = max(range(task_capacity + 1), key=lambda w: first_half_row[w] + second_half_row[task_capacity - w])
+        stack.append((start, middle, split))
+        stack.append((middle, end, task_capacity - split))
+    # returning the included items in descending order as the knapsack backtrack does
+    return sorted(included_items, reverse=True)
+
+
+# Function to compute only the last value row of the knapsack, the rows before it and the choices are not kept. The
+# row is a NumPy array when NumPy is installed and a list otherwise.
+def get_last_row(capacity, values, costs):
+    if np is not None:
+        row = np.zeros(capacity + 1, dtype=np.float64)
+        for value, cost in zip(values, costs):
+            row = get_next_row_numpy(row, value, cost)[0]
+        return row
+    row = [0] * (capacity + 1)
+    for value, cost in zip(values, costs):
+        row = get_next_row_python(row, value, cost)[0]
+    return row
+
+
+# Knapsack which finds the k best distinct selections of items instead of only the best one. Items costing more than
+# the capacity are left out and the costs and capacity are divided by their greatest common divisor first, as in the
+# problem reduction, the dominance check is not used because a dominated item can still be in the second best
+# selection. Each cell of the table keeps up to k values in descending order, for the best selections of the items so
+# far costing at most the budget of the cell, and only a compact array of choices is kept for each item. The selections
+# which skip an item and the ones which take it can never be the same, so merging the two keeps every selection in a
+# cell distinct. Takes O(k * n * capacity) time. Returns a list of up to k included item lists, best first, each in
+# descending order as the knapsack backtrack does.
+def top_k_knapsack(capacity, values, costs, k):
+    assert isinstance(k, int) and k > 0, 'Input "k" needs to be a positive integer'
+    index_list = [i for i in range(len(costs)) if costs[i] <= capacity]
+    cost_divisor = 0
+    for i in index_list:
+        cost_divisor = math.gcd(cost_divisor, costs[i])
+    cost_divisor = max(cost_divisor, 1)
+    reduced_capacity = capacity // cost_divisor
+    reduced_values = [values[i] for i in index_list]
+    reduced_costs = [costs[i] // cost_divisor for i in index_list]
+
+    typecode = get_choice_typecode(2 * k)
+    if np is not None:
+        num_selections, choices = get_top_k_table_numpy(reduced_capacity, reduced_values, reduced_costs, k, typecode)
+    else:
+        num_selections, choices = get_top_k_table_python(reduced_capacity, reduced_values, reduced_costs, k, typecode)
+
+    included_item_lists = []
+    for rank in range(num_selections):
+        included_items = []
+        w = reduced_capacity
+        for i in range(len(reduced_costs) - 1, -1, -1):
+            choice = choices[i][w * k + rank]
+            if choice < k:
+                rank = choice
+            else:
+                rank = choice - k
+                included_items.append(index_list[i])
+                w -= reduced_costs[i]
+        included_item_lists.append(included_items)
+    return included_item_lists
+
+
+# Pure Python engine for the top k table, used when NumPy is not installed. The choice for the entry at rank r of the
+# cell at budget w is kept at position w * k + r of the item's array, a choice below k is the rank of the entry it came
+# from in the same cell of the previous row when the item is skipped, and k plus that rank in the cell the item was
+# added to when it is taken. Returns the number of selections at the capacity and the list of choice arrays.
+def get_top_k_table_python(capacity, values, costs, k, typecode):
+    row = [[0] for w in range(capacity + 1)]
+    choices = []
+    for value, cost in zip(values, costs):
+        new_row = []
+        item_choices = array(typecode, [0]) * ((capacity + 1) * k)
+        for w in range(capacity + 1):
+            skipped = [(entry, j) for j, entry in enumerate(row[w])]
+            taken = [(entry + value, k + j) for j, entry in enumerate(row[w - cost])] if cost <= w else []
+            merged = merge_top_k(skipped, taken, k)
+            for rank, (entry, choice) in enumerate(merged):
+                item_choices[w * k + rank] = choice
+            new_row.append([entry for entry, choice in merged])
+        row = new_row
+        choices.append(item_choices)
+    return len(row[capacity]), choices
+
+
+# NumPy engine for the top k table, each row is a capacity by k array of values with missing entries at minus infinity.
+# The skipped and taken entries of every cell are put side by side and a stable sort keeps the k best, so skipped
+# entries are kept first when values are equal as in the Python engine.
+def get_top_k_table_numpy(capacity, values, costs, k, typecode):
+    row = np.full((capacity + 1, k), -np.inf)
+    row[:, 0] = 0
+    choices = []
+    for value, cost in zip(values, costs):
+        taken = np.full((capacity + 1, k), -np.inf)
+        taken[cost:] = row[:capacity + 1 - cost] + value
+        candidates = np.concatenate([row, taken], axis=1)
+        order = np.argsort(-candidates, axis=1, kind='stable')[:, :k]
+        row = np.take_along_axis(candidates, order, axis=1)
+        choices.append(array(typecode, order.astype(typecode).tobytes()))
+    return int(np.isfinite(row[capacity]).sum()), choices
+
+
+# Function to merge two lists of entries in order of descending value into the k best entries, entries of the first
+# list are kept first when values are equal
+def merge_top_k(first, second, k):
+    merged = []
+    i = j = 0
+    while len(merged) < k and (i < len(first) or j < len(second)):
+        if j == len(second) or (i < len(first) and first[i][0] >= second[j][0]):
+            merged.append(first[i])
+            i += 1
+        else:
+            merged.append(second[j])
+            j += 1
+    return merged
+
+
+# Function to shrink a knapsack problem before it is solved. Returns the reduced capacity, values and costs, the index
+# of each kept item in the original lists and a dictionary of statistics describing what the reduction removed.
+def reduce_knapsack(capacity, values, costs):
+    num_items = len(costs)
+    statistics = dict(
+        num_items=num_items,
+        short_circuit=False,
+        num_over_budget=0,
+        num_dominated=0,
+        cost_divisor=1,
+        num_remaining_items=num_items,
+    )
+
+    # when everything already fits in the budget there is nothing to optimise, every item with a value is taken
+    if capacity > 0 and sum(costs) <= capacity:
+        statistics['short_circuit'] = True
+        index_list = [i for i in range(num_items) if values[i] > 0]
+        statistics['num_remaining_items'] = len(index_list)
+        return capacity, [values[i] for i in index_list], [costs[i] for i in index_list], index_list, statistics
+
+    # items costing more than the whole budget can never be chosen
+    affordable_index_list = [i for i in range(num_items) if costs[i] <= capacity]
+    statistics['num_over_budget'] = num_items - len(affordable_index_list)
+
+    # An item is dominated by every other item which costs no more and gives at least as much value. Any solution
+    # containing a dominated item while missing one of its dominators can swap the two without losing value, so the
+    # item is only needed when it fits alongside all of its dominators. Items are visited cheapest and most valuable
+    # first so dominators are always decided before the items they dominate.
+    kept_index_list = []
+    for i in sorted(affordable_index_list, key=lambda x: (costs[x], -values[x], x)):
+        dominator_costs = costs[i]
+        for j in kept_index_list:
+            if values[j] >= values[i]:
+                dominator_costs += costs[j]
+                if dominator_costs > capacity:
+                    break
+        if dominator_costs > capacity:
+            statistics['num_dominated'] += 1
+        else:
+            kept_index_list.append(i)
+    # keeping the original order of the items so ties are broken in the same way as the un-reduced problem
+    index_list = sorted(kept_index_list)
+
+    # dividing the costs and the capacity by their greatest common divisor shrinks the table without changing it, this
+    # is skipped when an item costs nothing as the 0th column of the table must stay at the original scale for it
+    cost_divisor = 0
+    for i in index_list:
+        cost_divisor = math.gcd(cost_divisor, costs[i])
+    if cost_divisor < 1 or 0 in (costs[i] for i in index_list):
+        cost_divisor = 1
+    statistics['cost_divisor'] = cost_divisor
+    statistics['num_remaining_items'] = len(index_list)
+
+    reduced_values = [values[i] for i in index_list]
+    reduced_costs = [costs[i] // cost_divisor for i in index_list]
+    return capacity // cost_divisor, reduced_values, reduced_costs, index_list, statistics
+
+
+# Sparse version of the knapsack which only keeps the (cost, value) states that are not dominated by a cheaper state
+# of at least the same value. The run time depends on the number of distinct states reached rather than on the size of
+# the capacity, so costs can be given in pence without making the problem 100 times bigger.
+def pareto_knapsack(capacity, values, costs):
+    frontiers = get_pareto_frontiers(capacity, values, costs)
+    # the values on a frontier strictly increase with cost so the last state is the best one within the capacity
+    return backtrack_pareto_frontiers(frontiers, len(frontiers[-1]) - 1)
+
+
+# Function to build one frontier per item, each state is a tuple of (cost, value, taken, parent) where parent is the
+# position of the state it came from on the previous frontier and taken says whether the item was added to it
+def get_pareto_frontiers(capacity, values, costs):
+    frontier = [(0, 0, False, None)]
+    frontiers = [frontier]
+    for value, cost in zip(values, costs):
+        candidates = [(state[0], state[1], False, j) for j, state in enumerate(frontier)]
+        candidates += [(state[0] + cost, state[1] + value, True, j) for j, state in enumerate(frontier)
+                       if state[0] + cost <= capacity]
+        # sorting by cost then by descending value, with states that skip the item first so ties are not taken
+        candidates.sort(key=lambda x: (x[0], -x[1], x[2]))
+        frontier = []
+        for state in candidates:
+            if not frontier or state[1] > frontier[-1][1]:
+                frontier.append(state)
+        frontiers.append(frontier)
+    return frontiers
+
+
+# Function to walk back through the frontiers from a state on the last frontier to find the included items
+def backtrack_pareto_frontiers(frontiers, position):
+    included_items = []
+    for i in range(len(frontiers) - 1, 0, -1):
+        cost, value, taken, parent = frontiers[i][position]
+        if taken:
+            included_items.append(i - 1)
+        position = parent
+    return included_items
+
+
+# Function to build the frontiers of a knapsack with two values for each item, such as the total area and the poor
+# condition area of each room. Each state is a tuple of (cost, (first value, second value), taken, parent) so that the
+# frontiers can be walked back with the function above, a state is dropped when another state costs no more and is at
+# least as good in both values, which keeps every trade-off between the two values at every cost.
+def get_bi_objective_frontiers(capacity, first_values, second_values, costs):
+    frontier = [(0, (0, 0), False, None)]
+    frontiers = [frontier]
+    for first_value, second_value, cost in zip(first_values, second_values, costs):
+        candidates = [(state[0], state[1], False, j) for j, state in enumerate(frontier)]
+        candidates += [(state[0] + cost, (state[1][0] + first_value, state[1][1] + second_value), True, j)
+                       for j, state in enumerate(frontier) if state[0] + cost <= capacity]
+        # sorting by cost then by descending values, with states that skip the item first so ties are not taken
+        candidates.sort(key=lambda x: (x[0], -x[1][0], -x[1][1], x[2]))
+        # every kept state costs no more than the states after it, so a state is kept only when no kept state has a
+        # first value at least as big with a second value at least as big, found with a Fenwick tree holding the best
+        # second value kept for the first values ranked in descending order
+        first_value_ranks = {first_value: rank for rank, first_value in
+                             enumerate(sorted({state[1][0] for state in candidates}, reverse=True), 1)}
+        tree = [-math.inf] * (len(first_value_ranks) + 1)
+        frontier = []
+        for state in candidates:
+            rank = first_value_ranks[state[1][0]]
+            if state[1][1] > get_fenwick_max(tree, rank):
+                frontier.append(state)
+                update_fenwick_max(tree, rank, state[1][1])
+        frontiers.append(frontier)
+    return frontiers
+
+
+# Function to find the biggest value at positions one to position of a Fenwick tree of maximums
+def get_fenwick_max(tree, position):
+    best = -math.inf
+    while position > 0:
+        best = max(best, tree[position])
+        position -= position & -position
+    return best
+
+
+# Function to raise the value at a position of a Fenwick tree of maximums
+def update_fenwick_max(tree, position, value):
+    while position < len(tree):
+        tree[position] = max(tree[position], value)
+        position += position & -position
+
+
+# Function to check if a pair of values is no better than another pair in either value
+def is_dominated(values, other_values):
+    return values[0] <= other_values[0] and values[1] <= other_values[1]
+
+
+# Function to return the positions of the states on the last bi-objective frontier which are the best trade-offs within
+# a budget, in order of descending first value
+def get_bi_objective_pareto_set(frontier, budget):
+    positions = [j for j, state in enumerate(frontier) if state[0] <= budget]
+    positions.sort(key=lambda j: (-frontier[j][1][0], -frontier[j][1][1], frontier[j][0]))
+    pareto_set = []
+    for j in positions:
+        if not any(is_dominated(frontier[j][1], frontier[k][1]) for k in pareto_set):
+            pareto_set.append(j)
+    return pareto_set
+
+
+# Exact branch and bound knapsack for a small number of items with a large capacity. Items are explored in order of
+# value per unit cost and a branch is abandoned when the bound from the linear relaxation (filling what is left of the
+# capacity greedily, with a fraction of the first item which does not fit) cannot beat the best selection found so far.
+# The run time depends on the number of items and how well the bound prunes, not on the size of the capacity.
+def branch_and_bound_knapsack(capacity, values, costs):
+    # items with no value can never improve a selection, items with no cost are explored first
+    order = [i for i in range(len(costs)) if values[i] > 0]
+    order.sort(key=lambda i: (-values[i] / costs[i] if costs[i] > 0 else -math.inf, i))
+    num_items = len(order)
+
+    def get_bound(position, remaining_capacity, value):
+        for i in order[position:]:
+            if costs[i] <= remaining_capacity:
+                remaining_capacity -= costs[i]
+                value += values[i]
+            else:
+                return value + values[i] * remaining_capacity / costs[i]
+        return value
+
+    best_value = 0
+    best_items = []
+    # each node on the stack is the position of the next item to decide, the capacity left, the value so far and the
+    # items chosen so far, the branch taking the item is pushed last so it is explored first
+    stack = [(0, capacity, 0, [])]
+    while stack:
+        position, remaining_capacity, value, chosen_items = stack.pop()
+        if value > best_value:
+            best_value = value
+            best_items = chosen_items
+        if position == num_items or get_bound(position, remaining_capacity, value) <= best_value:
+            continue
+        i = order[position]
+        stack.append((position + 1, remaining_capacity, value, chosen_items))
+        if costs[i] <= remaining_capacity:
+            stack.append((position + 1, remaining_capacity - costs[i], value + values[i], chosen_items + [i]))
+
+    # returning the included items in descending order as the knapsack backtrack does
+    return sorted(best_items, reverse=True)
+
+
+# Function to find the value of the linear relaxation of the knapsack, where a fraction of an item may be taken. It is
+# never less than the best value of the real knapsack so it is used as an upper bound.
+def get_linear_relaxation_bound(capacity, values, costs):
+    order = [i for i in range(len(costs)) if values[i] > 0]
+    order.sort(key=lambda i: (-values[i] / costs[i] if costs[i] > 0 else -math.inf, i))
+    bound = 0
+    remaining_capacity = capacity
+    for i in order:
+        if costs[i] <= remaining_capacity:
+            remaining_capacity -= costs[i]
+            bound += values[i]
+        else:
+            return bound + values[i] * remaining_capacity / costs[i]
+    return bound
+
+
+# Approximate knapsack (a fully polynomial time approximation scheme). The greedy lower bound is at least half of the
+# best value, so the values are divided by epsilon times the lower bound over n, rounded down and capped at
+# 2n / epsilon, which no selection can go over. The rounding loses less than epsilon times the best value, so the
+# selection found is guaranteed to reach at least (1 - epsilon) of the optimum. The scaled problem is solved exactly by
+# finding the cheapest way of reaching every scaled value, which is O(n * n / epsilon) whatever the size of the
+# capacity. Items costing nothing are always taken.
+def fptas_knapsack(capacity, values, costs, epsilon=0.1):
+    assert isinstance(epsilon, Number) and 0 < epsilon < 1, 'Input "epsilon" needs to be numeric and between 0 and 1'
+    free_items = [i for i in range(len(costs)) if costs[i] == 0 and values[i] > 0]
+    candidate_list = [i for i in range(len(costs)) if values[i] > 0 and 0 < costs[i] <= capacity]
+    lower_bound = get_greedy_lower_bound(capacity, [values[i] for i in candidate_list],
+                                         [costs[i] for i in candidate_list])
+    if lower_bound == 0:
+        return sorted(free_items, reverse=True)
+    scale = epsilon * lower_bound / len(candidate_list)
+    max_scaled_value = math.floor(2 * len(candidate_list) / epsilon)
+    scaled_values = [min(math.floor(values[i] / scale), max_scaled_value) for i in candidate_list]
+    candidate_costs = [costs[i] for i in candidate_list]
+    if np is not None:
+        row, decisions = get_min_cost_table_numpy(max_scaled_value, scaled_values, candidate_costs)
+    else:
+        row, decisions = get_min_cost_table_python(max_scaled_value, scaled_values, candidate_costs)
+    best_scaled_value = max(v for v in range(max_scaled_value + 1) if row[v] <= capacity)
+    included_items = backtrack_decision_table(decisions, scaled_values, best_scaled_value)
+    return sorted(free_items + [candidate_list[i] for i in included_items], reverse=True)
+
+
+# Function to find a lower bound on the best value of the knapsack, the better of filling the budget greedily in order
+# of value per cost and taking the single most valuable item, which is always at least half of the best value
+def get_greedy_lower_bound(capacity, values, costs):
+    order = sorted(range(len(costs)), key=lambda i: (-values[i] / costs[i], i))
+    greedy_value = 0
+    remaining_capacity = capacity
+    for i in order:
+        if costs[i] <= remaining_capacity:
+            remaining_capacity -= costs[i]
+            greedy_value += values[i]
+    return max([greedy_value] + values)
+
+
+# Pure Python engine for the table of the cheapest cost of reaching every scaled value up to max_value, used when NumPy
+# is not installed. Returns the last row and a list with one bit-packed bytes object per item where bit v is set when
+# the item is taken to reach the value v, so it is walked back with the decision table backtrack.
+def get_min_cost_table_python(max_value, values, costs):
+    row = [0] + [math.inf] * max_value
+    decisions = []
+    for value, cost in zip(values, costs):
+        new_row = row[:]
+        bits = bytearray((max_value >> 3) + 1)
+        for v in range(value, max_value + 1):
+            taken = row[v - value] + cost
+            if taken < row[v]:
+                new_row[v] = taken
+                bits[v >> 3] |= 1 << (v & 7)
+        row = new_row
+        decisions.append(bytes(bits))
+    return row, decisions
+
+
+# NumPy engine for the table of the cheapest cost of reaching every scaled value, each item is one shifted-array
+# minimum over the previous row with the same comparisons as the Python engine
+def get_min_cost_table_numpy(max_value, values, costs):
+    row = np.full(max_value + 1, np.inf)
+    row[0] = 0
+    decisions = []
+    for value, cost in zip(values, costs):
+        new_row = row.copy()
+        taken = np.zeros(max_value + 1, dtype=bool)
+        if value <= max_value:
+            candidates = row[:max_value + 1 - value] + cost
+            taken[value:] = candidates < row[value:]
+            np.minimum(candidates, row[value:], out=new_row[value:])
+        row = new_row
+        decisions.append(np.packbits(taken, bitorder='little').tobytes())
+    return row.tolist(), decisions
+
+
+# Function to give a proven upper bound on the best possible value for a selection found with the approximate knapsack,
+# the smaller of the bound guaranteed by epsilon and the bound from the linear relaxation
+def get_fptas_upper_bound(capacity, values, costs, included_items, epsilon):
+    found_value = sum(values[i] for i in included_items)
+    return min(found_value / (1 - epsilon), get_linear_relaxation_bound(capacity, values, costs))
+
+
+# Exhaustive knapsack for at most 20 items, the cost and value of every subset is built by doubling the list of
+# subsets found so far with each item, so the position of a subset in the list is the bit mask of its items
+def brute_force_knapsack(capacity, values, costs):
+    assert len(costs) <= 20, 'The brute force knapsack can only be used with 20 items or fewer'
+    subset_costs = [0]
+    subset_values = [0]
+    for value, cost in zip(values, costs):
+        subset_costs += [subset_cost + cost for subset_cost in subset_costs]
+        subset_values += [subset_value + value for subset_value in subset_values]
+
+    best_mask = 0
+    for mask in range(1, len(subset_costs)):
+        if subset_costs[mask] <= capacity and subset_values[mask] > subset_values[best_mask]:
+            best_mask = mask
+    return [i for i in range(len(costs) - 1, -1, -1) if best_mask >> i & 1]
+
+
+# Multiple-choice knapsack where the items are split into groups and at most one option of each group can be taken,
+# values and costs are lists with a list of option values and a list of option costs for each group. Every group is
+# one row of the table, a cell keeps the option taken at that budget plus one, or zero when the group is left out, in
+# the smallest unsigned integer which can hold the largest group. An earlier option in a group is kept when a later one
+# only equals it. Returns the index of the chosen option for each group, or None for a group which is left out.
+def multiple_choice_knapsack(capacity, values, costs):
+    typecode = get_choice_typecode(max((len(group_costs) for group_costs in costs), default=0))
+    if np is not None:
+        row = np.zeros(capacity + 1, dtype=np.float64)
+    else:
+        row = [0] * (capacity + 1)
+
+    choices = []
+    for group_values, group_costs in zip(values, costs):
+        if np is not None:
+            row, group_choices = get_next_group_row_numpy(row, group_values, group_costs, typecode)
+        else:
+            row, group_choices = get_next_group_row_python(row, group_values, group_costs, typecode)
+        choices.append(group_choices)
+
+    chosen_options = [None] * len(costs)
+    w = capacity
+    for group in range(len(costs) - 1, -1, -1):
+        option = choices[group][w]
+        if option:
+            chosen_options[group] = option - 1
+            w -= costs[group][option - 1]
+    return chosen_options
+
+
+# Function to pick the array type code of the smallest unsigned integer which can hold every option number of a group
+def get_choice_typecode(num_options):
+    if num_options < 2 ** 8:
+        return 'B'
+    if num_options < 2 ** 16:
+        return 'H'
+    return 'L'
+
+
+# Function to list the selections of items worth choosing between as options of a multiple-choice knapsack group, which
+# are the best selections at each budget where the best value goes up, so every selection on the list is worth more
+# than the cheaper ones. Returns a list of included item lists in order of cost.
+def get_efficient_selections(capacity, values, costs):
+    best_value_list, decisions = get_decision_table(capacity, values, costs)
+    selections = []
+    for budget in range(1, capacity + 1):
+        if best_value_list[budget] > best_value_list[budget - 1]:
+            selections.append(backtrack_decision_table(decisions, costs, budget))
+    return selections
+
+
+# Function to compute the next row of the multiple-choice table and the option taken at each budget
+def get_next_group_row_python(row, group_values, group_costs, typecode):
+    capacity = len(row) - 1
+    new_row = row[:]
+    group_choices = array(typecode, [0]) * (capacity + 1)
+    for option, (value, cost) in enumerate(zip(group_values, group_costs)):
+        for w in range(cost, capacity + 1):
+            taken = value + row[w - cost]
+            if taken > new_row[w]:
+                new_row[w] = taken
+                group_choices[w] = option + 1
+    return new_row, group_choices
+
+
+# NumPy version of the function above, each option is compared against the whole row at once
+def get_next_group_row_numpy(row, group_values, group_costs, typecode):
+    capacity = len(row) - 1
+    new_row = row.copy()
+    group_choices = np.zeros(capacity + 1, dtype=typecode)
+    for option, (value, cost) in enumerate(zip(group_values, group_costs)):
+        if cost <= capacity:
+            candidates = row[:capacity + 1 - cost] + value
+            taken = candidates > new_row[cost:]
+            new_row[cost:][taken] = candidates[taken]
+            group_choices[cost:][taken] = option + 1
+    return new_row, array(typecode, group_choices.tobytes())
+
+
+# Largest number of ways of assigning the items to the knapsacks which the exact multiple knapsack is used for
+MAX_EXACT_ASSIGNMENTS = 10 ** 6
+
+
+# Multiple knapsack which assigns each item to at most one of several knapsacks, such as the budgets of the phases of a
+# job, to get the most total value. Small problems are solved exactly and larger ones with the sequential heuristic.
+# Returns the index of the knapsack each item is assigned to, or None for an item left out, and whether it is exact.
+def multiple_knapsack(capacities, values, costs):
+    if (len(capacities) + 1) ** len(costs) <= MAX_EXACT_ASSIGNMENTS:
+        return exact_multiple_knapsack(capacities, values, costs), True
+    return sequential_multiple_knapsack(capacities, values, costs), False
+
+
+# Exact multiple knapsack, a depth first search over the items which remembers the best value of the remaining items
+# for each set of remaining capacities. When several assignments are equally good the earliest knapsack is used.
+def exact_multiple_knapsack(capacities, values, costs):
+    num_items = len(costs)
+    best_values = {}
+
+    def get_best_value(i, remaining):
+        if i == num_items:
+            return 0
+        if (i, remaining) not in best_values:
+            best_value = get_best_value(i + 1, remaining)
+            for k, assignment in get_assignments(i, remaining):
+                best_value = max(best_value, values[i] + get_best_value(i + 1, assignment))
+            best_values[(i, remaining)] = best_value
+        return best_values[(i, remaining)]
+
+    # each knapsack which item i fits in with the capacities left after putting it there
+    def get_assignments(i, remaining):
+        if values[i] <= 0:
+            return []
+        return [(k, remaining[:k] + (capacity - costs[i],) + remaining[k + 1:])
+                for k, capacity in enumerate(remaining) if costs[i] <= capacity]
+
+    assigned_knapsacks = []
+    remaining = tuple(capacities)
+    for i in range(num_items):
+        best_value = get_best_value(i, remaining)
+        assigned_knapsack = None
+        for k, assignment in get_assignments(i, remaining):
+            if values[i] + get_best_value(i + 1, assignment) == best_value:
+                assigned_knapsack = k
+                remaining = assignment
+                break
+        assigned_knapsacks.append(assigned_knapsack)
+    return assigned_knapsacks
+
+
+# Heuristic multiple knapsack which fills each knapsack in turn with an optimal choice of the items still left, so it
+# only needs one knapsack solve for each knapsack
+def sequential_multiple_knapsack(capacities, values, costs):
+    assigned_knapsacks = [None] * len(costs)
+    for k, capacity in enumerate(capacities):
+        index_list = [i for i in range(len(costs)) if assigned_knapsacks[i] is None]
+        included_items = reduced_knapsack(capacity, [values[i] for i in index_list], [costs[i] for i in index_list])[0]
+        for j in included_items:
+            assigned_knapsacks[index_list[j]] = k
+    return assigned_knapsacks
+
+
+# Tables of the cheapest cover of each amount for each catalogue of sizes and prices already used, so the tables are
+# only built once per catalogue and only grown when a larger amount is asked for. The least recently used tables are
+# dropped when more catalogues than the limit have been used.
+MIN_COST_COVER_TABLES = OrderedDict()
+MAX_MIN_COST_COVER_TABLES = 32
+
+
+# Unbounded minimum cost cover, the cheapest mix of any number of each size, such as tins of paint, which adds up to at
+# least the amount. The amount and sizes are whole numbers. The sizes are divided by their greatest common divisor and
+# the amount is divided by it rounding up, which covers the same amounts in far fewer steps, such as 500 millilitres
+# for tins of 1, 2.5, 5 and 10 litres. Each entry of the table is the cheapest cost of covering that amount and the
+# size bought last, and covering an amount with a size bigger than it costs only that size. Returns the number of each
+# size to buy.
+def min_cost_cover(amount, sizes, prices):
+    assert sizes, 'Input "sizes" needs to have at least one size'
+    for size in sizes:
+        assert isinstance(size, int) and size > 0, 'Input "sizes" needs to be a list of positive integers'
+    size_divisor = 0
+    for size in sizes:
+        size_divisor = math.gcd(size_divisor, size)
+    sizes = [size // size_divisor for size in sizes]
+    amount = -(-amount // size_divisor)
+
+    key = (tuple(sizes), tuple(prices))
+    cover_costs, last_sizes = MIN_COST_COVER_TABLES.pop(key, ([0], [None]))
+    MIN_COST_COVER_TABLES[key] = (cover_costs, last_sizes)
+    while len(MIN_COST_COVER_TABLES) > MAX_MIN_COST_COVER_TABLES:
+        MIN_COST_COVER_TABLES.popitem(last=False)
+    for covered_amount in range(len(cover_costs), amount + 1):
+        best_cost = None
+        best_size = None
+        for j, (size, price) in enumerate(zip(sizes, prices)):
+            cost = cover_costs[max(covered_amount - size, 0)] + price
+            if best_cost is None or cost < best_cost:
+                best_cost = cost
+                best_size = j
+        cover_costs.append(best_cost)
+        last_sizes.append(best_size)
+
+    counts = [0] * len(sizes)
+    covered_amount = amount
+    while covered_amount > 0:
+        j = last_sizes[covered_amount]
+        counts[j] += 1
+        covered_amount = max(covered_amount - sizes[j], 0)
+    return counts
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------ Solver registry -----------------------------------------------------
+
+# Registry of the solvers which can be selected by the Job optimisers. Each solver declares the number of cost units
+# per pound it works in, whether it is exact, the most items it can take and a cost model which gives a rough count of
+# the operations it needs for the shape of a problem, so the cheapest solver can be picked automatically.
+KNAPSACK_SOLVERS = {}
+
+
+def register_solver(name, function, cost_scale, cost_model, exact=True, max_items=None, memory_model=None):
+    KNAPSACK_SOLVERS[name] = dict(
+        function=function,
+        cost_scale=cost_scale,
+        cost_model=cost_model,
+        exact=exact,
+        max_items=max_items,
+        memory_model=memory_model,
+    )
+
+
+# Solvers whose memory model estimates more bytes than this are not picked automatically
+MAX_SOLVER_MEMORY = 1024 ** 3
+
+
+# Function to describe the shape of a problem for the cost models, the capacity and costs are in whole pounds
+def get_problem_shape(capacity, costs):
+    positive_costs = [cost for cost in costs if cost > 0]
+    cost_gcd = 0
+    for cost in positive_costs:
+        cost_gcd = math.gcd(cost_gcd, cost)
+    return dict(
+        num_items=len(costs),
+        capacity=capacity,
+        min_cost=min(positive_costs, default=1),
+        max_cost=max(positive_costs, default=1),
+        cost_gcd=max(cost_gcd, 1),
+    )
+
+
+# The dense table fills one cell for every item and every budget pound, NumPy fills a row about fifty times faster
+def get_dense_cost(shape, epsilon=None):
+    cells = shape['num_items'] * (shape['capacity'] // shape['cost_gcd'] + 1)
+    if np is not None:
+        return cells / 50
+    return cells
+
+
+# The dense table holds one bit for every item and every budget pound and two value rows
+def get_dense_memory(shape, epsilon=None):
+    columns = shape['capacity'] // shape['cost_gcd'] + 1
+    return shape['num_items'] * columns / 8 + columns * 16
+
+
+# The linear memory knapsack recomputes the rows about log2(n) times over but only holds a few rows at once
+def get_linear_cost(shape, epsilon=None):
+    return get_dense_cost(shape) * max(math.log2(max(shape['num_items'], 1)), 1) * 2
+
+
+def get_linear_memory(shape, epsilon=None):
+    return (shape['capacity'] + 1) * 32
+
+
+# The Pareto frontier can hold at most one state for each distinct total cost in pence. At most capacity // min_cost
+# items fit in the budget, and the totals of i items lie between i * min_cost and i * max_cost, so a narrow spread of
+# costs keeps the number of states small whatever the size of the budget.
+def get_pareto_num_states(shape):
+    num_items = shape['num_items']
+    max_items_in_budget = min(num_items, shape['capacity'] // shape['min_cost'])
+    cost_spread = (shape['max_cost'] - shape['min_cost']) * 100
+    max_states = shape['capacity'] * 100 + 1
+    num_states = 1
+    for i in range(1, max_items_in_budget + 1):
+        num_states += min(math.comb(num_items, i), i * cost_spread + 1)
+        if num_states >= max_states:
+            num_states = max_states
+            break
+    return num_states
+
+
+def get_pareto_cost(shape, epsilon=None):
+    return shape['num_items'] * get_pareto_num_states(shape) * 4
+
+
+# Every frontier is kept for the backtrack, each state is a tuple of about 100 bytes
+def get_pareto_memory(shape, epsilon=None):
+    return shape['num_items'] * get_pareto_num_states(shape) * 100
+
+
+# Branch and bound explores far fewer than 2 ** n nodes when the linear relaxation bound is tight, the square root of
+# the full tree is used as its typical size. The estimate is worked out in log space so that it is infinite, rather
+# than overflowing, for thousands of items.
+def get_branch_and_bound_cost(shape, epsilon=None):
+    log_cost = math.log2(max(shape['num_items'], 1) * 4) + shape['num_items'] / 2
+    if log_cost >= 1024:
+        return math.inf
+    return 2 ** log_cost
+
+
+# Brute force visits every subset once and holds the cost and value of every subset
+def get_brute_force_cost(shape, epsilon=None):
+    return 2 ** shape['num_items'] * 2
+
+
+def get_brute_force_memory(shape, epsilon=None):
+    return 2 ** shape['num_items'] * 80
+
+
+# The approximate knapsack fills one cell for every item and every scaled value up to 2n / epsilon, NumPy fills a row
+# about fifty times faster as it does for the dense table
+def get_fptas_cost(shape, epsilon=None):
+    cells = shape['num_items'] * (2 * shape['num_items'] / epsilon + 1)
+    if np is not None:
+        return cells / 50
+    return cells
+
+
+# The approximate knapsack holds one bit for every item and every scaled value and two cost rows
+def get_fptas_memory(shape, epsilon=None):
+    columns = 2 * shape['num_items'] / epsilon + 1
+    return shape['num_items'] * columns / 8 + columns * 16
+
+
+register_solver('dense', rolling_knapsack, 1, get_dense_cost, memory_model=get_dense_memory)
+register_solver('linear', linear_knapsack, 1, get_linear_cost, memory_model=get_linear_memory)
+register_solver('pareto', pareto_knapsack, 100, get_pareto_cost, memory_model=get_pareto_memory)
+register_solver('branch_and_bound', branch_and_bound_knapsack, 100, get_branch_and_bound_cost)
+register_solver('brute_force', brute_force_knapsack, 100, get_brute_force_cost, max_items=20,
+                memory_model=get_brute_force_memory)
+register_solver('fptas', fptas_knapsack, 100, get_fptas_cost, exact=False, memory_model=get_fptas_memory)
+
+
+# Function to pick the solver for a problem. A requested solver is used as it is, otherwise every solver which accepts
+# the number of items and fits in the memory limit is costed with its cost model and the cheapest one is picked,
+# approximate solvers are only considered when an epsilon is given. The capacity and costs are in whole pounds. A log
+# line records which solver was picked and why.
+def select_solver(capacity, costs, solver=None, epsilon=None, max_memory=None):
+    if max_memory is None:
+        max_memory = MAX_SOLVER_MEMORY
+    if solver is not None:
+        assert solver in KNAPSACK_SOLVERS, 'Input "solver" needs to be one of ' + ', '.join(KNAPSACK_SOLVERS)
+        logger.info('Using the %s knapsack solver as requested', solver)
+        return solver
+
+    shape = get_problem_shape(capacity, costs)
+    estimated_costs = dict()
+    for name, entry in KNAPSACK_SOLVERS.items():
+        if entry['max_items'] is not None and shape['num_items'] > entry['max_items']:
+            continue
+        if not entry['exact'] and epsilon is None:
+            continue
+        if entry['memory_model'] is not None and entry['memory_model'](shape, epsilon) > max_memory:
+            continue
+        estimated_costs[name] = entry['cost_model'](shape, epsilon)
+    solver = min(estimated_costs, key=estimated_costs.get)
+    logger.info('Using the %s knapsack solver for %d items and a budget of %d, estimated operations: %s', solver,
+                shape['num_items'], capacity,
+                ', '.join(f'{name}={estimate:.0f}' for name, estimate in estimated_costs.items()))
+    return solver
+
+
+# Function to reduce a knapsack problem, solve what is left with the chosen solver and map the included items back
+# to the original indices. Any keyword arguments are passed on to the solver. Returns the included items and the
+# reduction statistics.
+def reduced_knapsack(capacity, values, costs, solver='dense', **kwargs):
+    assert solver in KNAPSACK_SOLVERS, 'Input "solver" needs to be one of ' + ', '.join(KNAPSACK_SOLVERS)
+    reduced_capacity, reduced_values, reduced_costs, index_list, statistics = reduce_knapsack(capacity, values, costs)
+    if statistics['short_circuit']:
+        included_items = list(range(len(index_list)))
+    else:
+        included_items = KNAPSACK_SOLVERS[solver]['function'](reduced_capacity, reduced_values, reduced_costs,
+                                                              **kwargs)
+    # returning the included items in descending order as the knapsack backtrack does
+    return sorted((index_list[i] for i in included_items), reverse=True), statistics
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------- Result cache -------------------------------------------------------
+
+# Default limit on the memory held by the results in the knapsack cache, in bytes
+MAX_CACHE_MEMORY = 16 * 1024 ** 2
+
+
+# Least recently used cache of knapsack results keyed by a fingerprint of the problem, so a problem which is solved
+# again, such as the same job optimised with the same budget and method, is answered without running the solver. The
+# size of each result is measured by pickling it, and the least recently used results are dropped when the results
+# held take more than the memory limit. Counts the hits and misses.
+class KnapsackCache:
+    def __init__(self, max_memory=MAX_CACHE_MEMORY):
+        assert isinstance(max_memory, int) and max_memory >= 0, 'Input "max_memory" needs to be a non-negative integer'
+        self.max_memory = max_memory
+        self.results = OrderedDict()
+        self.memory = 0
+        self.hits = 0
+        self.misses = 0
+
+    # Method to fingerprint a problem, the values and costs are kept in order because the results are positions
+    @staticmethod
+    def get_key(capacity, values, costs, solver, **kwargs):
+        problem = (capacity, tuple(values), tuple(costs), solver, tuple(sorted(kwargs.items())))
+        return hashlib.sha256(repr(problem).encode()).hexdigest()
+
+    # Method to return the result stored for a key, or None when there is none, counting the hit or the miss
+    def get(self, key):
+        if key not in self.results:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.results.move_to_end(key)
+        return pickle.loads(self.results[key])
+
+    # Method to store the result for a key, dropping the least recently used results to stay in the memory limit. A
+    # result bigger than the whole memory limit is not stored.
+    def put(self, key, result):
+        stored_result = pickle.dumps(result)
+        if len(stored_result) > self.max_memory:
+            return
+        if key in self.results:
+            self.memory -= len(self.results.pop(key))
+        self.results[key] = stored_result
+        self.memory += len(stored_result)
+        while self.memory > self.max_memory:
+            self.memory -= len(self.results.popitem(last=False)[1])
+
+    # Method to empty the cache and reset the counters
+    def clear(self):
+        self.results.clear()
+        self.memory = 0
+        self.hits = 0
+        self.misses = 0
+
+    # Method to return a dictionary of the hits, misses, number of stored results and memory used
+    def get_statistics(self):
+        return dict(hits=self.hits, misses=self.misses, num_results=len(self.results), memory=self.memory)
+
+
+# The cache shared by the Job optimisers
+KNAPSACK_CACHE = KnapsackCache()
+
+
+# Function to run the reduced knapsack through the shared cache, the result is the same as the reduced knapsack's and
+# is a fresh copy each time so it can be changed without changing the cache
+def cached_reduced_knapsack(capacity, values, costs, solver='dense', **kwargs):
+    key = KNAPSACK_CACHE.get_key(capacity, values, costs, solver, **kwargs)
+    result = KNAPSACK_CACHE.get(key)
+    if result is None:
+        result = reduced_knapsack(capacity, values, costs, solver, **kwargs)
+        KNAPSACK_CACHE.put(key, result)
+    return result
+
+
+# Incremental knapsack which keeps the value row after every item so that the problem can be edited without solving it
+# again from the first item. Appending an item computes one new row, removing or replacing an item recomputes only the
+# rows after it, and the best value without any single item is found from a prefix row and a suffix row. Items costing
+# nothing are taken in the 0th column of the rows too, so a prefix row and a suffix row can be added at any split.
+class IncrementalKnapsack:
+    def __init__(self, capacity, values=None, costs=None):
+        assert isinstance(capacity, int) and capacity >= 0, 'Input "capacity" needs to be a non-negative integer'
+        self.capacity = capacity
+        self.values = []
+        self.costs = []
+        # rows[i] holds the best value for every budget using the first i items
+        if np is not None:
+            self.rows = [np.zeros(capacity + 1, dtype=np.float64)]
+        else:
+            self.rows = [[0] * (capacity + 1)]
+        self.decisions = []
+        # suffix_rows[i] holds the best value for every budget using the items from i onwards, built when needed
+        self.suffix_rows = None
+        for value, cost in zip(values or [], costs or []):
+            self.append(value, cost)
+
+    # Method to compute the row after adding one item with whichever engine is available
+    @staticmethod
+    def get_next_row(row, value, cost):
+        if np is not None:
+            return get_next_row_numpy(row, value, cost, fill_zero_column=True)
+        return get_next_row_python(row, value, cost, fill_zero_column=True)
+
+    # Method to add an item to the end of the problem
+    def append(self, value, cost):
+        self.values.append(value)
+        self.costs.append(cost)
+        row, bits = self.get_next_row(self.rows[-1], value, cost)
+        self.rows.append(row)
+        self.decisions.append(bits)
+        self.suffix_rows = None
+
+    # Method to remove the item at an index
+    def remove(self, index):
+        del self.values[index]
+        del self.costs[index]
+        self.recompute_from(index)
+
+    # Method to replace the value and cost of the item at an index
+    def replace(self, index, value, cost):
+        self.values[index] = value
+        self.costs[index] = cost
+        self.recompute_from(index)
+
+    # Method to recompute the rows of every item from an index onwards, the rows before it are kept as they are
+    def recompute_from(self, index):
+        del self.rows[index + 1:]
+        del self.decisions[index:]
+        for value, cost in zip(self.values[index:], self.costs[index:]):
+            row, bits = self.get_next_row(self.rows[-1], value, cost)
+            self.rows.append(row)
+            self.decisions.append(bits)
+        self.suffix_rows = None
+
+    # Method to return the best value for a budget, by default the full capacity
+    def get_best_value(self, budget=None):
+        if budget is None:
+            budget = self.capacity
+        return self.rows[-1][budget]
+
+    # Method to backtrack the items included for a budget, by default the full capacity
+    def get_included_items(self, budget=None):
+        if budget is None:
+            budget = self.capacity
+        return backtrack_decision_table(self.decisions, self.costs, budget)
+
+    # Method to build the suffix rows, from the last item back to the first
+    def get_suffix_rows(self):
+        if self.suffix_rows is None:
+            suffix_rows = [self.rows[0]]
+            for value, cost in zip(reversed(self.values), reversed(self.costs)):
+                suffix_rows.append(self.get_next_row(suffix_rows[-1], value, cost)[0])
+            suffix_rows.reverse()
+            self.suffix_rows = suffix_rows
+        return self.suffix_rows
+
+    # Method to find the best value for a budget when the item at an index is left out, the budget is split between the
+    # items before it and the items after it in every possible way which takes O(capacity) once the suffix rows exist
+    def get_best_value_without(self, index, budget=None):
+        if budget is None:
+            budget = self.capacity
+        prefix_row = self.rows[index]
+        suffix_row = self.get_suffix_rows()[index + 1]
+        if np is not None:
+            return (prefix_row[:budget + 1] + suffix_row[budget::-1]).max()
+        return max(prefix_row[w] + suffix_row[budget - w] for w in range(budget + 1))
@@ -1,4 +1,7 @@
+import copy
+import pickle
 import pytest
+import tracemalloc
 import core
 import paint_link
 
@@ -509,6 +512,18 @@ def test_get_area_cost_lists(surface_list, expected_values, expected_costs):
     assert costs == expected_costs
 
 
+@pytest.mark.parametrize(
+    'surface_list, cost_scale, expected_costs',
+    [
+        (job_1.get_painting_surface_list(), 100, [2184, 3163, 4046, 17226]),
+    ],
+)
+# Testing the cost list can be prepared in pence for the solvers which work with exact costs
+def test_get_area_cost_lists_cost_scale(surface_list, cost_scale, expected_costs):
+    values, costs = core.Job.get_area_cost_lists(surface_list, cost_scale)
+    assert costs == expected_costs
+
+
 @pytest.mark.parametrize(
     'job, budget, expected_budgeted_list',
     [
@@ -523,6 +538,476 @@ def test_get_optimised_job(job, budget, expected_budgeted_list):
     assert optimised_job.budgeted_painting_surface_list == expected_budgeted_list
 
 
+@pytest.mark.parametrize(
+    'job, budget, solver, expected_area, expected_price',
+    [
+        (job_1, 200, 'dense', 21, 194.08),
+        (job_1, 200, 'pareto', 21, 194.08),
+        # Testing exact pence costs fit a surface which rounding every price up to whole pounds leaves out
+        (job_1, 94, 'dense', 18, 72.08),
+        (job_1, 94, 'pareto', 19, 93.91),
+        (job_1, 94, 'branch_and_bound', 19, 93.91),
+    ],
+)
+# Testing the optimisation of a job with each of the knapsack solvers
+def test_get_optimised_job_solver(job, budget, solver, expected_area, expected_price):
+    optimised_job = job.get_optimised_job(budget, solver=solver)
+    assert optimised_job.solver == solver
+    summary = optimised_job.get_summary()
+    assert summary['total_surface_area_in_budget'] == expected_area
+    assert summary['total_budgeted_job_price'] == expected_price
+
+
+# Testing the optimisers pick a solver automatically and log which one ran and why
+def test_optimiser_solver_selection(caplog):
+    with caplog.at_level('INFO', logger='knapsack'):
+        optimised_jobs = [job_1.get_optimised_job(94), job_1.get_optimised_rooms_job(150),
+                          job_2.get_optimised_condition_job(150)]
+    for optimised_job in optimised_jobs:
+        assert optimised_job.solver in core.knapsack.KNAPSACK_SOLVERS
+        assert f'Using the {optimised_job.solver} knapsack solver' in caplog.text
+
+
+@pytest.mark.parametrize('epsilon', [None, 0.5])
+# Testing a solver is picked for a job with thousands of surfaces
+def test_optimiser_solver_selection_large_job(epsilon):
+    painting_surfaces = [core.PaintingSurface(core.Wall(5 + i % 11, substrate=core.Plaster()), core.MattEmulsionPaint())
+                         for i in range(2100)]
+    job = core.Job([core.Room(painting_surfaces)])
+    optimised_job = job.get_optimised_job(1000, epsilon=epsilon)
+    assert optimised_job.solver in core.knapsack.KNAPSACK_SOLVERS
+    assert 0 < optimised_job.get_summary()['total_budgeted_job_price'] <= 1000
+
+
+@pytest.mark.parametrize(
+    'job, budget, epsilon, expected_area, expected_upper_bound',
+    [
+        (job_1, 200, 0.1, 21, 23.33),
+        (job_1, 94, 0.5, 18, 20.54),
+    ],
+)
+# Testing the approximate optimisation records epsilon and the proven upper bound in the summary
+def test_get_optimised_job_epsilon(job, budget, epsilon, expected_area, expected_upper_bound):
+    summary = job.get_optimised_job(budget, solver='fptas', epsilon=epsilon).get_summary()
+    assert summary['total_surface_area_in_budget'] == expected_area
+    assert summary['epsilon'] == epsilon
+    assert summary['optimal_area_upper_bound'] == expected_upper_bound
+
+
+@pytest.mark.parametrize(
+    'job, max_budget, expected_breakpoints',
+    [
+        (job_1, 100, [(0, 0), (22, 1), (32, 8), (41, 10), (63, 11), (73, 18), (95, 19)]),
+        (job_1, 0, [(0, 0)]),
+    ],
+)
+# Testing the area against budget curve of the budget frontier
+def test_budget_frontier_breakpoints(job, max_budget, expected_breakpoints):
+    frontier = job.get_budget_frontier(max_budget)
+    assert frontier.get_breakpoints() == expected_breakpoints
+
+
+@pytest.mark.parametrize(
+    'job, budget',
+    [
+        (job_1, 0),
+        (job_1, 50),
+        (job_1, 94),
+        (job_1, 200),
+        (job_1, 300),
+    ],
+)
+# Testing the budget frontier rebuilds the same optimised job as solving for the budget directly
+def test_budget_frontier_optimised_job(job, budget):
+    frontier = job.get_budget_frontier(300)
+    assert frontier.get_best_area(budget) == job.get_optimised_job(budget).get_summary()[
+        'total_surface_area_in_budget']
+    assert frontier.get_optimised_job(budget).get_summary() == job.get_optimised_job(budget).get_summary()
+
+
+PAINT_CATALOGUE = {
+    'Vinyl Matt Emulsion': core.MattEmulsionPaint,
+    'Diamond Matt Emulsion': core.DiamondMattEmulsion,
+    'Silk Emulsion': core.SilkEmulsionPaint,
+    'Eggshell': core.OilEggshell,
+    'Gloss': core.OilGloss,
+    'Satinwood': core.OilSatin,
+}
+
+paint_choice_job = core.Job([
+    core.Room([core.PaintingSurface(core.Wall(20, substrate=core.Plaster()), core.DiamondMattEmulsion()),
+               core.PaintingSurface(core.Wall(10), core.SilkEmulsionPaint())], name='lounge'),
+    core.Room([core.PaintingSurface(core.Skirtingboard(2, substrate=core.Mdf(primed=True)), core.OilSatin())],
+              name='hall'),
+])
+
+
+@pytest.mark.parametrize(
+    'job, budget, expected_area, expected_paints',
+    [
+        # Testing every surface is downgraded to a cheaper finish of the same paint type to paint the whole job
+        (paint_choice_job, 250, 32, ['MattEmulsionPaint', 'OilGloss', 'MattEmulsionPaint']),
+        # Testing the surfaces keep their own paints when the budget covers them
+        (paint_choice_job, 300, 32, ['SilkEmulsionPaint', 'OilSatin', 'DiamondMattEmulsion']),
+        (paint_choice_job, 150, 12, ['SilkEmulsionPaint', 'OilSatin']),
+    ],
+)
+# Testing the optimisation which picks the paint finish of each surface
+def test_get_optimised_paint_job(job, budget, expected_area, expected_paints):
+    optimised_job = job.get_optimised_paint_job(budget, PAINT_CATALOGUE)
+    summary = optimised_job.get_summary()
+    assert summary['total_surface_area_in_budget'] == expected_area
+    assert summary['total_budgeted_job_price'] <= budget
+    assert summary['total_surface_area_in_budget'] >= job.get_optimised_job(budget).get_summary()[
+        'total_surface_area_in_budget']
+    assert [choice['chosen_paint'] for choice in optimised_job.paint_choices] == expected_paints
+    for breakdown in optimised_job.get_breakdown():
+        assert breakdown['paint'] in expected_paints
+
+
+# Testing the paint options of a surface only swap paints for paints of the same type
+def test_get_paint_option_list():
+    painting_surface = core.PaintingSurface(core.Wall(10), core.SilkEmulsionPaint())
+    option_list = core.Job.get_paint_option_list(painting_surface, PAINT_CATALOGUE)
+    assert option_list[0] is painting_surface
+    assert [type(option.paint) for option in option_list] == [core.SilkEmulsionPaint, core.MattEmulsionPaint,
+                                                              core.DiamondMattEmulsion]
+    custom_surface = core.PaintingSurface(core.Wall(10), core.Paint(10, 5, 17))
+    assert core.Job.get_paint_option_list(custom_surface, PAINT_CATALOGUE) == [custom_surface]
+
+
+@pytest.mark.parametrize('max_exact_assignments, expected_solver', [(10 ** 6, 'exact_multiple'),
+                                                                   (0, 'sequential_multiple')])
+@pytest.mark.parametrize(
+    'job, budgets, by_rooms, expected_areas, expected_leftover_area',
+    [
+        (job_1, [50, 180], False, [10, 20], 9),
+        (job_1, [100, 60, 50], False, [19, 0, 0], 20),
+        # Testing whole rooms are kept together across the phases
+        (job_1, [100, 300], True, [18, 21], 0),
+        (job_1, [], False, [], 39),
+    ],
+)
+# Testing the plan of a job over several budget phases with the exact planner and the sequential heuristic
+def test_plan_phases(job, budgets, by_rooms, expected_areas, expected_leftover_area, max_exact_assignments,
+                     expected_solver, monkeypatch):
+    monkeypatch.setattr(core.knapsack, 'MAX_EXACT_ASSIGNMENTS', max_exact_assignments)
+    optimised_job_list, leftover_list = job.plan_phases(budgets, by_rooms=by_rooms)
+    assert [optimised_job.get_summary()['total_surface_area_in_budget'] for optimised_job in optimised_job_list] == \
+        expected_areas
+    assert sum(painting_surface.surface.area for painting_surface in leftover_list) == expected_leftover_area
+    for optimised_job, budget in zip(optimised_job_list, budgets):
+        assert optimised_job.solver == expected_solver
+        assert optimised_job.get_summary()['total_budgeted_job_price'] <= budget
+
+
+# Testing the phase budgets are validated
+def test_plan_phases_error():
+    with pytest.raises(AssertionError) as e:
+        job_1.plan_phases([100, -1])
+    assert e.value.args[0] == 'Input "budgets" needs to be a list of whole numbers greater than or equal to zero'
+
+
+@pytest.mark.parametrize(
+    'budget, must_include, exclude, expected_area, expected_price',
+    [
+        (200, [], [], 21, 194.08),
+        # Testing a pinned surface is paid for first and the rest of the budget is optimised
+        (200, [3], [], 21, 194.08),
+        (200, [2], [], 19, 93.91),
+        # Testing an excluded surface is never chosen
+        (200, [], [0], 20, 172.25),
+        (200, [1], [2, 3], 9, 53.46),
+    ],
+)
+# Testing pinned and excluded surfaces in the surface optimisation
+def test_get_optimised_job_constraints(budget, must_include, exclude, expected_area, expected_price):
+    surface_list = job_1.get_painting_surface_list()
+    optimised_job = job_1.get_optimised_job(budget, must_include=[surface_list[i] for i in must_include],
+                                            exclude=[surface_list[i] for i in exclude])
+    summary = optimised_job.get_summary()
+    assert summary['total_surface_area_in_budget'] == expected_area
+    assert summary['total_budgeted_job_price'] == expected_price
+    for i in must_include:
+        assert surface_list[i] in optimised_job.budgeted_painting_surface_list
+    for i in exclude:
+        assert surface_list[i] not in optimised_job.budgeted_painting_surface_list
+
+
+# Testing pinned and excluded rooms in the room optimisations and a room pinning all of its surfaces
+def test_get_optimised_rooms_job_constraints():
+    cheap_room, expensive_room = job_1.get_sorted_room_list()
+    summary = job_1.get_optimised_rooms_job(200, must_include=[cheap_room]).get_summary()
+    assert summary['total_surface_area_in_budget'] == 18
+    summary = job_1.get_optimised_condition_job(200, exclude=[expensive_room]).get_summary()
+    assert summary['total_budgeted_job_price'] <= 72.08
+    optimised_job = job_1.get_optimised_job(100, must_include=[cheap_room])
+    assert optimised_job.get_summary()['total_surface_area_in_budget'] == 19
+    assert all(painting_surface in optimised_job.budgeted_painting_surface_list
+               for painting_surface in cheap_room.painting_surfaces)
+
+
+@pytest.mark.parametrize(
+    'kwargs, error_message',
+    [
+        (dict(must_include=['lounge']),
+         'Input "must_include" needs to be a list of painting surfaces or rooms in the job'),
+        (dict(exclude=[core.PaintingSurface(core.Wall(1), core.MattEmulsionPaint())]),
+         'Input "exclude" needs to be a list of painting surfaces or rooms in the job'),
+        (dict(must_include=[job_1.rooms[1]]), 'The items in "must_include" cost more than the budget'),
+        (dict(must_include=[job_1.rooms[0]], exclude=[job_1.rooms[0]]),
+         'An item cannot be in both "must_include" and "exclude"'),
+        (dict(k=3, solver='dense'), 'Input "k" cannot be given with "solver" or "epsilon"'),
+        (dict(k=3, epsilon=0.1), 'Input "k" cannot be given with "solver" or "epsilon"'),
+    ],
+)
+# Testing the validation of the pinned and excluded items
+def test_get_optimised_job_constraints_error(kwargs, error_message):
+    with pytest.raises(AssertionError) as e:
+        job_1.get_optimised_job(100, **kwargs)
+    assert e.value.args[0] == error_message
+
+
+@pytest.mark.parametrize(
+    'job, budget, expected_areas',
+    [
+        (job_1, 0, [0]),
+        (job_1, 50, [10, 8, 1]),
+        (job_1, 94, [18, 11, 10]),
+        (job_1, 200, [21, 20, 19]),
+    ],
+)
+# Testing the three best alternative choices of surfaces are returned from one solve
+def test_get_optimised_job_top_k(job, budget, expected_areas):
+    optimised_job_list = job.get_optimised_job(budget, k=3)
+    assert [optimised_job.get_summary()['total_surface_area_in_budget'] for optimised_job in optimised_job_list] == \
+        expected_areas
+    assert optimised_job_list[0].get_summary()['total_surface_area_in_budget'] == job.get_optimised_job(
+        budget, solver='dense').get_summary()['total_surface_area_in_budget']
+    for optimised_job in optimised_job_list:
+        assert optimised_job.get_summary()['total_budgeted_job_price'] <= budget
+
+
+@pytest.mark.parametrize(
+    'job, budget, partial_room_penalty, expected_area',
+    [
+        # Testing no penalty gives the same area as the surface optimisation
+        (job_1, 30, 0, 1),
+        (job_1, 100, 0, 19),
+        # Testing a partial room is only painted when its area is more than the penalty
+        (job_1, 30, 2, 0),
+        (job_1, 50, 5, 10),
+        (job_1, 100, 5, 18),
+        (job_1, 250, 5, 38),
+        # Testing a large penalty gives the same area as the rooms optimisation
+        (job_1, 250, 100, 21),
+        (job_1, 300, 100, 39),
+    ],
+)
+# Testing the grouped optimisation of surfaces which prefers whole rooms
+def test_get_optimised_grouped_job(job, budget, partial_room_penalty, expected_area):
+    optimised_job = job.get_optimised_grouped_job(budget, partial_room_penalty)
+    summary = optimised_job.get_summary()
+    assert summary['total_surface_area_in_budget'] == expected_area
+    assert summary['total_budgeted_job_price'] <= budget
+    assert optimised_job.solver == 'grouped'
+
+
+# Testing the grouped optimisation of rooms of a dozen walls, which have hundreds of choices each, finds the best area
+# when there is no penalty for painting part of a room
+def test_get_optimised_grouped_job_large_rooms():
+    rooms = []
+    for room_index in range(3):
+        painting_surfaces = [
+            core.PaintingSurface(core.Wall(round(7.3 + (i * 5.37) % 11 + room_index * 0.41, 2),
+                                           substrate=core.Plaster()), core.MattEmulsionPaint())
+            for i in range(12)]
+        rooms.append(core.Room(painting_surfaces, name=f'room {room_index}'))
+    job = core.Job(rooms)
+    for budget in [300, 1000, 2500]:
+        summary = job.get_optimised_grouped_job(budget, partial_room_penalty=0).get_summary()
+        assert summary['total_surface_area_in_budget'] == \
+            job.get_optimised_job(budget, solver='dense').get_summary()['total_surface_area_in_budget']
+        assert summary['total_budgeted_job_price'] <= budget
+    assert job.get_optimised_grouped_job(1000).get_summary()['total_budgeted_job_price'] <= 1000
+
+
+# Testing the validation of the partial room penalty
+def test_get_optimised_grouped_job_error():
+    with pytest.raises(AssertionError) as e:
+        job_1.get_optimised_grouped_job(100, -1)
+    assert e.value.args[0] == 'Input "partial_room_penalty" needs to be numeric and greater than or equal to zero'
+
+
+# Testing optimising a job again with the same budget and method is answered from the cache
+def test_get_optimised_job_cache():
+    core.knapsack.KNAPSACK_CACHE.clear()
+    summary_list = [job_1.get_optimised_job(200).get_summary(), job_1.get_optimised_rooms_job(200).get_summary()]
+    assert core.knapsack.KNAPSACK_CACHE.get_statistics()['misses'] == 2
+    assert [job_1.get_optimised_job(200).get_summary(), job_1.get_optimised_rooms_job(200).get_summary()] == \
+        summary_list
+    assert core.knapsack.KNAPSACK_CACHE.get_statistics()['hits'] == 2
+
+
+# Testing the optimisations run in parallel give the same summaries as running them one after another
+def test_compare_optimisations():
+    comparison = job_1.compare_optimisations(200)
+    assert list(comparison) == list(core.JOB_OPTIMISERS)
+    for name, optimiser in core.JOB_OPTIMISERS.items():
+        assert comparison[name] == optimiser(job_1, 200).get_summary()
+    comparison = job_1.compare_optimisations(100, dict(grouped=core.Job.get_optimised_grouped_job))
+    assert comparison == dict(grouped=job_1.get_optimised_grouped_job(100).get_summary())
+
+
+# Testing the surfaces are priced once before the job is copied to the workers and the copies keep the prices
+def test_compare_optimisations_shared_prices(monkeypatch):
+    job = core.Job([core.Room([core.PaintingSurface(core.Wall(10 + i), core.MattEmulsionPaint()) for i in range(4)])])
+    job.compare_optimisations(100, dict(surfaces=core.Job.get_optimised_job))
+    for painting_surface in job.get_painting_surface_list():
+        assert painting_surface.price_key == painting_surface.get_price_key()
+    monkeypatch.setattr(core.PaintingSurface, 'calculate_price_components', None)
+    assert pickle.loads(pickle.dumps(job)).get_total_price() == job.get_total_price()
+
+
+@pytest.mark.parametrize(
+    'job, budget, expected_area, expected_shared_tin_price',
+    [
+        (job_1, 0, 0, 0),
+        (job_1, 100, 10, 73.87),
+        # Testing surfaces needing a tin each can be worth leaving for one big surface when tins are whole
+        (job_1, 250, 21, 246.1),
+        (job_1, 270, 30, 267.9),
+        (job_1, 400, 39, 378.77),
+    ],
+)
+# Testing the optimisation which pays for whole tins of paint shared between surfaces
+def test_get_optimised_tin_job(job, budget, expected_area, expected_shared_tin_price):
+    optimised_job = job.get_optimised_tin_job(budget)
+    summary = optimised_job.get_summary()
+    assert summary['total_surface_area_in_budget'] == expected_area
+    assert summary['total_shared_tin_price'] == expected_shared_tin_price
+    assert summary['total_shared_tin_price'] <= budget
+    assert sum(purchase['total_price'] for purchase in optimised_job.purchasing_list) == pytest.approx(
+        summary['total_shared_tin_price'] - sum(painting_surface.get_labour_price()
+                                                for painting_surface in optimised_job.budgeted_painting_surface_list))
+
+
+@pytest.mark.parametrize('num_paints', [1, 2, 3])
+# Testing the shared tin optimisation, which is a heuristic, stays in budget and finds close to the area found by trying
+# every choice of walls when one, two or three paints share their tins, and stays quick for a large job
+def test_get_optimised_tin_job_brute_force(num_paints):
+    paints = [core.MattEmulsionPaint, core.SilkEmulsionPaint, core.OilGloss][:num_paints]
+
+    def get_job(num_surfaces):
+        painting_surfaces = [core.PaintingSurface(core.Wall(round(3.1 + (i * 7.93) % 19, 2), substrate=core.Plaster()),
+                                                  paints[i % num_paints]()) for i in range(num_surfaces)]
+        return core.Job([core.Room(painting_surfaces)])
+
+    job = get_job(11)
+    surface_list = job.get_painting_surface_list()
+    choices = [[surface_list[i] for i in range(11) if mask >> i & 1] for mask in range(1, 2 ** 11)]
+    choice_costs = [(core.get_shared_tin_price(choice),
+                     sum(painting_surface.surface.area for painting_surface in choice)) for choice in choices]
+    for budget in [150, 300, 467, 700, 1000]:
+        summary = job.get_optimised_tin_job(budget).get_summary()
+        assert summary['total_shared_tin_price'] <= budget
+        assert summary['total_surface_area_in_budget'] >= 0.95 * max(area for cost, area in choice_costs
+                                                                     if cost <= budget)
+
+    summary = get_job(200).get_optimised_tin_job(4000).get_summary()
+    assert summary['total_shared_tin_price'] <= 4000
+    assert summary['total_surface_area_in_budget'] > 400
+
+
+# Testing surfaces sharing a paint share its tins in the purchasing list and the price
+def test_get_purchasing_list():
+    painting_surface_list = [core.PaintingSurface(core.Wall(60), core.MattEmulsionPaint()),
+                             core.PaintingSurface(core.Wall(60), core.MattEmulsionPaint()),
+                             core.PaintingSurface(core.Skirtingboard(2), core.OilGloss())]
+    assert core.get_purchasing_list(painting_surface_list) == [
+        dict(paint='MattEmulsionPaint', unit=5, tin_price=37.87, units_of_paint=1.41, num_tins=2, total_price=75.74),
+        dict(paint='OilGloss', unit=2.5, tin_price=19.0, units_of_paint=0.05, num_tins=1, total_price=19.0),
+    ]
+    assert core.get_shared_tin_price(painting_surface_list) == pytest.approx(216 * 2 + 20 + 75.74 + 19)
+
+
+@pytest.mark.parametrize(
+    'tin_catalogue, expected_emulsion_tins, expected_emulsion_price',
+    [
+        # Testing paints missing from the catalogue are bought in their own tin size
+        (None, {5: 2}, 75.74),
+        (dict(MattEmulsionPaint={1: 12, 2.5: 22, 5: 37.87, 10: 65}), {2.5: 1, 5: 1}, 59.87),
+        (dict(MattEmulsionPaint={1: 12, 2.5: 30, 5: 37.87, 10: 65}), {10: 1}, 65),
+        # Testing tin sizes which are not whole decilitres are not rounded up, 7.06 litres needs ten 0.75 litre tins
+        (dict(MattEmulsionPaint={0.75: 5}), {0.75: 10}, 50),
+    ],
+)
+# Testing the cheapest tins are planned for the litres of each paint over the whole job
+def test_get_tin_purchase_plan(tin_catalogue, expected_emulsion_tins, expected_emulsion_price):
+    job = core.Job([core.Room([core.PaintingSurface(core.Wall(60), core.MattEmulsionPaint()),
+                               core.PaintingSurface(core.Skirtingboard(2), core.OilGloss()),
+                               core.PaintingSurface(core.Wall(60), core.MattEmulsionPaint())])])
+    tin_purchase_plan = job.get_tin_purchase_plan(tin_catalogue)
+    assert tin_purchase_plan == [
+        dict(paint='OilGloss', litres=0.12, tins={2.5: 1}, total_price=19.0),
+        dict(paint='MattEmulsionPaint', litres=7.06, tins=expected_emulsion_tins, total_price=expected_emulsion_price),
+    ]
+
+
+# Testing the persistent job optimiser gives the same best area as a full solve after each edit
+def test_job_optimiser():
+    job = core.Job([
+        core.Room([core.PaintingSurface(core.Wall(8), core.MattEmulsionPaint()),
+                   core.PaintingSurface(core.Wall(10), core.MattEmulsionPaint())], name='lounge'),
+        core.Room([core.PaintingSurface(core.Wall(20, substrate=core.Plaster()), core.DiamondMattEmulsion()),
+                   core.PaintingSurface(core.Skirtingboard(1, substrate=core.Mdf(primed=True)), core.OilEggshell())],
+                  name='hall'),
+    ])
+    optimiser = job.get_optimiser(300)
+    assert job.get_optimiser(300) is optimiser
+
+    def assert_matches_full_solve(budget):
+        expected = job.get_optimised_job(budget).get_summary()
+        assert optimiser.get_optimised_job(budget).get_summary() == expected
+
+    new_painting_surface = core.PaintingSurface(core.Ceiling(12), core.MattEmulsionPaint())
+    optimiser.add_surface(job.rooms[0], new_painting_surface)
+    assert new_painting_surface.surface.room_name == 'lounge'
+    assert_matches_full_solve(150)
+    optimiser.remove_surface(job.rooms[1].painting_surfaces[1])
+    assert len(job.rooms[1].painting_surfaces) == 1
+    assert_matches_full_solve(150)
+    optimiser.replace_surface(new_painting_surface, core.PaintingSurface(core.Ceiling(3), core.MattEmulsionPaint()))
+    assert_matches_full_solve(100)
+    job.rooms[0].painting_surfaces[0].surface.area = 2
+    optimiser.update_surface(job.rooms[0].painting_surfaces[0])
+    assert_matches_full_solve(60)
+
+    # Testing the best area without a surface matches optimising the job without it
+    painting_surface = job.rooms[1].painting_surfaces[0]
+    best_area_without = optimiser.get_best_area_without(painting_surface, 200)
+    optimiser.remove_surface(painting_surface)
+    assert best_area_without == job.get_optimised_job(200).get_summary()['total_surface_area_in_budget']
+
+
+@pytest.mark.parametrize(
+    'job, budget, expected_statistics',
+    [
+        (job_1, 200, dict(num_items=4, short_circuit=False, num_over_budget=0, num_dominated=0, cost_divisor=1,
+                          num_remaining_items=4)),
+        # Testing the optimisation is skipped when the whole job already fits in the budget
+        (job_1, 500, dict(num_items=4, short_circuit=True, num_over_budget=0, num_dominated=0, cost_divisor=1,
+                          num_remaining_items=4)),
+        (job_1, 100, dict(num_items=4, short_circuit=False, num_over_budget=1, num_dominated=0, cost_divisor=1,
+                          num_remaining_items=3)),
+    ],
+)
+# Testing the reduction statistics are reported on the optimised job
+def test_get_optimised_job_reduction_statistics(job, budget, expected_statistics):
+    optimised_job = job.get_optimised_job(budget)
+    assert optimised_job.reduction_statistics == expected_statistics
+
+
 @pytest.mark.parametrize(
     'optimised_job, expected_summary_dict',
     [
@@ -595,4 +1080,227 @@ job_2 = core.Job([room_3, room_4])
 def test_room_optimise_get_summary(optimised_job, expected_summary_dict):
     summary = optimised_job.get_summary()
     for key in list(summary.keys()):
-        assert summary[key] == pytest.approx(expected_summary_dict[key], 0.01)
\ No newline at end of file
+        assert summary[key] == pytest.approx(expected_summary_dict[key], 0.01)
+
+
+@pytest.mark.parametrize(
+    'job, budget, expected_pareto_set',
+    [
+        (job_1, 50, [(0, 0)]),
+        (job_1, 300, [(39, 0)]),
+        # Testing the most area and the most poor condition area are both on the frontier when they need other rooms
+        (job_2, 200, [(21, 0), (18, 18)]),
+        (job_2, 400, [(39, 18)]),
+    ],
+)
+# Testing the area condition frontier matches the rooms and condition optimisations at the ends of each pareto set
+def test_area_condition_frontier(job, budget, expected_pareto_set):
+    frontier = job.get_area_condition_frontier(400)
+    pareto_set = frontier.get_pareto_set(budget)
+    assert pareto_set == expected_pareto_set
+    assert pareto_set[0][0] == job.get_optimised_rooms_job(budget).get_summary()['total_surface_area_in_budget']
+    optimised_job_list = frontier.get_optimised_job_list(budget)
+    assert [optimised_job.get_summary()['total_surface_area_in_budget'] for optimised_job in optimised_job_list] == \
+        [total_area for total_area, condition_area in pareto_set]
+
+
+# Testing the surfaces, substrates and paints have no instance dictionaries and share their constant properties
+def test_shared_properties():
+    painting_surface_list = [core.PaintingSurface(core.Door(1, substrate=core.PrePaintedWood()), core.OilGloss())
+                             for i in range(2)]
+    for painting_surface in painting_surface_list:
+        for item in [painting_surface, painting_surface.surface, painting_surface.surface.substrate,
+                     painting_surface.paint]:
+            assert not hasattr(item, '__dict__')
+    first_surface, second_surface = [painting_surface.surface for painting_surface in painting_surface_list]
+    assert first_surface.design_options is second_surface.design_options
+    assert first_surface.substrate.condition_assumption is second_surface.substrate.condition_assumption
+    assert first_surface.substrate.condition_options is core.CONDITION_OPTIONS
+
+
+# Testing the memory of a large list of painting surfaces, each one was over 600 bytes with instance dictionaries and a
+# set of condition assumptions for every substrate
+def test_painting_surface_memory():
+    def get_painting_surface_list(num_surfaces):
+        return [core.PaintingSurface(core.Wall(10 + i % 7, substrate=core.Plaster()), core.MattEmulsionPaint())
+                for i in range(num_surfaces)]
+
+    get_painting_surface_list(10)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        painting_surface_list = get_painting_surface_list(10000)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    memory = sum(statistic.size_diff for statistic in after.compare_to(before, 'filename'))
+    assert len(painting_surface_list) == 10000
+    assert memory / 10000 < 400
+
+
+# Testing the prices of a painting surface are worked out once and worked out again after any change they depend on
+def test_painting_surface_price_cache(monkeypatch):
+    painting_surface = core.PaintingSurface(core.Wall(10, substrate=core.Plaster()), core.MattEmulsionPaint())
+    num_calculations = []
+    calculate_price_components = core.PaintingSurface.calculate_price_components
+
+    def counting_calculate_price_components(self):
+        num_calculations.append(1)
+        return calculate_price_components(self)
+
+    monkeypatch.setattr(core.PaintingSurface, 'calculate_price_components', counting_calculate_price_components)
+    painting_surface.get_breakdown()
+    painting_surface.get_total_price()
+    assert len(num_calculations) == 1
+
+    edits = [
+        lambda: setattr(painting_surface.surface, 'area', 20),
+        lambda: setattr(painting_surface.surface.substrate, 'num_coats', 3),
+        lambda: setattr(painting_surface.surface, 'substrate', core.NewLiningPaper()),
+        lambda: setattr(painting_surface.paint, 'price', 40),
+        lambda: setattr(painting_surface, 'paint', core.OilGloss()),
+        lambda: setattr(painting_surface, 'labour_price_msq', 5),
+    ]
+    for edit in edits:
+        edit()
+        num_calculations.clear()
+        total_price = painting_surface.get_total_price()
+        painting_surface.get_units_of_paint()
+        assert len(num_calculations) == 1
+        new_painting_surface = core.PaintingSurface(painting_surface.surface, painting_surface.paint,
+                                                    painting_surface.labour_price_msq)
+        assert total_price == new_painting_surface.get_total_price()
+
+
+# Testing the job frame prices every surface exactly as the painting surfaces do and totals each room as the rooms do
+def test_job_frame():
+    paint_list = [core.MattEmulsionPaint(), core.OilGloss(), core.SilkEmulsionPaint(), core.Primer(),
+                  core.Paint(12.34, 2.5, 13.3)]
+    substrate_list = [core.Plaster(), core.Mdf(), core.NewWood(), core.PrePaintedEmulsion(condition='poor'),
+                      core.PrePaintedWood(condition='okay')]
+    surface_class_list = [core.Wall, core.Door, core.Window, core.Skirtingboard, core.Spindle, core.Radiator]
+    rooms = []
+    for room_index in range(5):
+        painting_surfaces = []
+        for i in range(12):
+            surface = surface_class_list[i % 6](1.37 * (i + 1) + room_index, substrate=substrate_list[i % 5])
+            painting_surfaces.append(core.PaintingSurface(surface, paint_list[(i + room_index) % 5],
+                                                          labour_price_msq=[None, 3.5, 4.25][i % 3]))
+        rooms.append(core.Room(painting_surfaces, name=f'room {room_index}'))
+    for job in [core.Job(rooms), job_1, job_2]:
+        job_frame = job.get_job_frame()
+        assert len(job_frame) == len(job.get_painting_surface_list())
+        assert job_frame.get_breakdown() == job.get_breakdown()
+        room_totals = job_frame.get_room_totals()
+        assert room_totals['total_price'].tolist() == [room.get_total_price() for room in job.rooms]
+        assert room_totals['labour_price'].tolist() == [room.get_labour_price() for room in job.rooms]
+        assert room_totals['surface_area'].tolist() == [room.get_total_surface_area() for room in job.rooms]
+        assert job_frame.get_total_price() == pytest.approx(job.get_total_price())
+
+
+# Testing the job frame needs NumPy
+def test_job_frame_without_numpy(monkeypatch):
+    monkeypatch.setattr(core, 'np', None)
+    with pytest.raises(AssertionError) as e:
+        job_1.get_job_frame()
+    assert e.value.args[0] == 'The job frame needs NumPy to be installed'
+
+
+# Testing the totals of rooms, jobs and optimised jobs match totalling each painting surface one getter at a time
+@pytest.mark.parametrize('job', [job_1, job_2])
+def test_get_totals(job):
+    def get_expected_totals(painting_surface_list):
+        surface_area_by_condition = {}
+        for painting_surface in painting_surface_list:
+            condition = painting_surface.surface.substrate.condition
+            surface_area_by_condition[condition] = \
+                surface_area_by_condition.get(condition, 0) + painting_surface.surface.area
+        return dict(
+            paint_price=sum(painting_surface.get_paint_price() for painting_surface in painting_surface_list),
+            labour_price=sum(painting_surface.get_labour_price() for painting_surface in painting_surface_list),
+            total_price=sum(painting_surface.get_total_price() for painting_surface in painting_surface_list),
+            surface_area=sum(painting_surface.surface.area for painting_surface in painting_surface_list),
+            surface_area_by_condition=surface_area_by_condition,
+        )
+
+    def assert_totals_equal(totals, expected_totals):
+        assert totals.keys() == expected_totals.keys()
+        for key in ['paint_price', 'labour_price', 'total_price', 'surface_area']:
+            assert totals[key] == pytest.approx(expected_totals[key])
+        assert totals['surface_area_by_condition'] == pytest.approx(expected_totals['surface_area_by_condition'])
+
+    for room in job.rooms:
+        assert_totals_equal(room.get_totals(), get_expected_totals(room.painting_surfaces))
+        assert room.get_total_surface_area_by_condition(['poor', 'bad']) == pytest.approx(sum(
+            painting_surface.surface.area for painting_surface in room.painting_surfaces
+            if painting_surface.surface.substrate.condition in ['poor', 'bad']))
+    job_totals = job.get_totals()
+    assert_totals_equal(job_totals, get_expected_totals(job.get_painting_surface_list()))
+    assert job.get_total_price() == sum(room.get_total_price() for room in job.rooms)
+    assert job.get_total_surface_area_by_condition(['poor']) == \
+        pytest.approx(job_totals['surface_area_by_condition'].get('poor', 0))
+
+    optimised_job = job.get_optimised_job(job.get_total_price() / 2)
+    assert_totals_equal(optimised_job.get_totals(), get_expected_totals(optimised_job.budgeted_painting_surface_list))
+
+
+@pytest.mark.parametrize(
+    'instance_class, args, kwargs',
+    [
+        (core.MattEmulsionPaint, [], dict()),
+        (core.OilGloss, [20.5, 2.5, 12], dict()),
+        (core.Paint, [12.34], dict(unit=2.5, coverage=13.3)),
+        (core.PrePaintedEmulsion, [], dict(condition='poor')),
+        (core.Plaster, [], dict()),
+        (core.Substrate, [], dict(num_coats=2, coverage_adjustment=1.1)),
+    ],
+)
+# Testing the catalogue shares one frozen instance for each class and set of arguments, priced as a new instance is
+def test_catalogue(instance_class, args, kwargs):
+    catalogue = core.Catalogue()
+    instance = catalogue.get_instance(instance_class, *args, **kwargs)
+    assert catalogue.get_instance(instance_class, *args, **kwargs) is instance
+    assert len(catalogue) == 1
+    assert type(instance) is instance_class
+    assert instance.is_frozen()
+    assert not instance_class(*args, **kwargs).is_frozen()
+    with pytest.raises(AssertionError) as e:
+        setattr(instance, 'price' if issubclass(instance_class, core.Paint) else 'num_coats', 3)
+    assert e.value.args[0] == f'{instance_class.__name__} object is frozen and can not be changed'
+
+    if issubclass(instance_class, core.Paint):
+        painting_surface = core.PaintingSurface(core.Wall(12), instance)
+        expected_painting_surface = core.PaintingSurface(core.Wall(12), instance_class(*args, **kwargs))
+    else:
+        painting_surface = core.PaintingSurface(core.Wall(12, substrate=instance), core.MattEmulsionPaint())
+        expected_painting_surface = core.PaintingSurface(core.Wall(12, substrate=instance_class(*args, **kwargs)),
+                                                         core.MattEmulsionPaint())
+    assert painting_surface.get_breakdown() == expected_painting_surface.get_breakdown()
+
+
+# Testing the catalogue only makes paints and substrates, and different arguments make different instances
+def test_catalogue_instances():
+    catalogue = core.Catalogue()
+    assert catalogue.get_instance(core.PrePaintedEmulsion, condition='poor') is not \
+        catalogue.get_instance(core.PrePaintedEmulsion, condition='good')
+    assert catalogue.get_instance(core.MattEmulsionPaint) is not catalogue.get_instance(core.SilkEmulsionPaint)
+    assert len(catalogue) == 4
+    assert core.get_catalogue_instance(core.Primer) is core.CATALOGUE.get_instance(core.Primer)
+    with pytest.raises(AssertionError) as e:
+        catalogue.get_instance(core.Wall, 10)
+    assert e.value.args[0] == 'Input "instance_class" needs to be a Paint or Substrate class'
+
+
+@pytest.mark.parametrize('copy_function', [lambda x: pickle.loads(pickle.dumps(x)), copy.deepcopy])
+# Testing pickled and copied objects keep their revisions, so catalogue objects stay frozen and cached prices are kept
+def test_revisioned_copy(copy_function, monkeypatch):
+    paint = copy_function(core.get_catalogue_instance(core.MattEmulsionPaint))
+    assert paint.is_frozen()
+    assert paint.price == 37.87
+    painting_surface = core.PaintingSurface(core.Wall(10, substrate=core.Plaster()), core.OilGloss())
+    painting_surface.surface.area = 12
+    total_price = painting_surface.get_total_price()
+    monkeypatch.setattr(core.PaintingSurface, 'calculate_price_components', None)
+    painting_surface_copy = copy_function(painting_surface)
+    assert painting_surface_copy.get_price_key() == painting_surface.get_price_key()
+    assert painting_surface_copy.get_total_price() == total_price
@@ -14,3 +14,544 @@ import knapsack
 def test_optimal_knapsack(args, kwargs, expected):
     optimal_list = knapsack.optimal_knapsack(*args, **kwargs)
     assert optimal_list == expected
+
+
+@pytest.mark.parametrize(
+    'capacity, values, costs',
+    [
+        # Testing the rolling mode picks the same items as the full matrix
+        (8, [1, 2, 5, 6], [2, 3, 4, 5]),
+        (8, [10, 1, 1, 1], [8, 8, 8, 8]),
+        (20, [3, 3, 3, 3, 3], [4, 4, 4, 4, 4]),
+        (0, [1, 2], [1, 1]),
+        (50, [1, 8, 10, 20, 0.5, 7.25], [22, 32, 41, 173, 1, 9]),
+        (100, [5, 12, 3, 7, 9, 14, 2, 8], [17, 31, 9, 22, 25, 40, 3, 20]),
+    ],
+)
+# Testing the rolling row knapsack with the bit-packed decision table against the full matrix
+def test_rolling_knapsack(capacity, values, costs):
+    expected = knapsack.optimal_knapsack(capacity, values, costs)
+    assert knapsack.optimal_knapsack(capacity, values, costs, mode='rolling') == expected
+
+
+@pytest.mark.parametrize(
+    'capacity, values, costs',
+    [
+        # Testing integer and float areas give the same decisions from both engines
+        (8, [1, 2, 5, 6], [2, 3, 4, 5]),
+        (20, [3, 3, 3, 3, 3], [4, 4, 4, 4, 4]),
+        (50, [1, 8, 10, 20, 0.5, 7.25], [22, 32, 41, 173, 1, 9]),
+        (100, [5, 12, 3, 7, 9, 14, 2, 8], [17, 31, 9, 22, 25, 40, 3, 20]),
+        (10, [0, 4, 4], [0, 0, 3]),
+    ],
+)
+# Testing the NumPy row engine builds exactly the same decision table as the pure Python engine
+def test_decision_table_engines(capacity, values, costs):
+    pytest.importorskip('numpy')
+    expected = knapsack.get_decision_table_python(capacity, values, costs)
+    assert knapsack.get_decision_table_numpy(capacity, values, costs) == expected
+
+
+# Testing the rolling knapsack falls back to the pure Python engine when NumPy is not installed
+def test_rolling_knapsack_without_numpy(monkeypatch):
+    monkeypatch.setattr(knapsack, 'np', None)
+    optimal_list = knapsack.optimal_knapsack(8, [1, 2, 5, 6], [2, 3, 4, 5], mode='rolling')
+    assert optimal_list == [3, 1]
+
+
+@pytest.mark.parametrize(
+    'capacity, values, costs, expected_included, expected_statistics',
+    [
+        # Testing the short circuit when everything fits in the budget
+        (20, [1, 2, 3], [5, 5, 5], [2, 1, 0], dict(short_circuit=True, num_over_budget=0, num_dominated=0,
+                                                    cost_divisor=1, num_remaining_items=3)),
+        # Testing items over budget are dropped and the costs are divided by their greatest common divisor
+        (25, [1, 2, 3, 9], [10, 20, 30, 40], [1], dict(short_circuit=False, num_over_budget=2, num_dominated=0,
+                                                      cost_divisor=10, num_remaining_items=2)),
+        # Testing dominated items are removed only when they cannot fit alongside all of their dominators
+        (10, [5, 4, 5, 4], [5, 5, 5, 6], [2, 0], dict(short_circuit=False, num_over_budget=0, num_dominated=2,
+                                                    cost_divisor=5, num_remaining_items=2)),
+        (8, [1, 2, 5, 6], [2, 3, 4, 5], [3, 1], dict(short_circuit=False, num_over_budget=0, num_dominated=0,
+                                                     cost_divisor=1, num_remaining_items=4)),
+    ],
+)
+# Testing the reduction pass run before the knapsack is solved
+def test_reduced_knapsack(capacity, values, costs, expected_included, expected_statistics):
+    included_items, statistics = knapsack.reduced_knapsack(capacity, values, costs)
+    assert included_items == expected_included
+    for key, value in expected_statistics.items():
+        assert statistics[key] == value
+
+
+@pytest.mark.parametrize(
+    'capacity, values, costs',
+    [
+        (10, [5, 4, 5, 4, 5], [5, 5, 5, 6, 5]),
+        (100, [5, 12, 3, 7, 9, 14, 2, 8], [17, 31, 9, 22, 25, 40, 3, 20]),
+        (60, [4, 4, 4, 3, 6, 6, 1], [10, 10, 12, 10, 20, 20, 2]),
+        # Testing the costs are not divided when an item costs nothing, the odd pound of the budget keeps it
+        (5, [4, 5, 1, 1], [0, 2, 2, 2]),
+    ],
+)
+# Testing the reduction never loses value compared with solving the full problem
+def test_reduced_knapsack_value(capacity, values, costs):
+    included_items, statistics = knapsack.reduced_knapsack(capacity, values, costs)
+    expected = knapsack.optimal_knapsack(capacity, values, costs)
+    assert sum(costs[i] for i in included_items) <= capacity
+    assert sum(values[i] for i in included_items) == sum(values[i] for i in expected)
+
+
+@pytest.mark.parametrize(
+    'capacity, values, costs, expected',
+    [
+        (8, [1, 2, 5, 6], [2, 3, 4, 5], [3, 1]),
+        (8, [10, 1, 1, 1], [8, 8, 8, 8], [0]),
+        # Testing costs in pence with a budget far larger than the number of states
+        (940000, [1, 8, 10, 20], [218400, 316300, 404600, 1722600], [2, 1, 0]),
+    ],
+)
+# Testing the sparse Pareto frontier knapsack
+def test_pareto_knapsack(capacity, values, costs, expected):
+    assert knapsack.pareto_knapsack(capacity, values, costs) == expected
+
+
+@pytest.mark.parametrize(
+    'capacity, values, costs',
+    [
+        (100, [5, 12, 3, 7, 9, 14, 2, 8], [17, 31, 9, 22, 25, 40, 3, 20]),
+        (50, [1, 8, 10, 20, 0.5, 7.25], [22, 32, 41, 173, 1, 9]),
+        (0, [1, 2], [1, 1]),
+    ],
+)
+# Testing the Pareto frontier knapsack finds the same best value as the full matrix
+def test_pareto_knapsack_value(capacity, values, costs):
+    included_items = knapsack.pareto_knapsack(capacity, values, costs)
+    expected = knapsack.optimal_knapsack(capacity, values, costs)
+    assert sum(costs[i] for i in included_items) <= capacity
+    assert sum(values[i] for i in included_items) == sum(values[i] for i in expected)
+
+
+@pytest.mark.parametrize(
+    'capacity, values, costs, expected',
+    [
+        (8, [1, 2, 5, 6], [2, 3, 4, 5], [3, 1]),
+        (8, [10, 1, 1, 1], [8, 8, 8, 8], [0]),
+        (0, [1, 2], [1, 1], []),
+        # Testing a budget of millions of pence is solved without depending on its size
+        (5000000, [1, 8, 10, 20, 35], [218400, 316300, 404600, 1722600, 3100000], [4, 3]),
+    ],
+)
+# Testing the branch and bound knapsack
+def test_branch_and_bound_knapsack(capacity, values, costs, expected):
+    assert knapsack.branch_and_bound_knapsack(capacity, values, costs) == expected
+
+
+@pytest.mark.parametrize(
+    'capacity, values, costs',
+    [
+        (100, [5, 12, 3, 7, 9, 14, 2, 8], [17, 31, 9, 22, 25, 40, 3, 20]),
+        (50, [1, 8, 10, 20, 0.5, 7.25], [22, 32, 41, 173, 1, 9]),
+        (60, [4, 4, 4, 3, 6, 6, 1, 0], [10, 10, 12, 10, 20, 20, 2, 0]),
+        (38, [4, 6, 9, 3], [0, 14, 23, 9]),
+    ],
+)
+# Testing the branch and bound knapsack finds the same best value as the full matrix
+def test_branch_and_bound_knapsack_value(capacity, values, costs):
+    included_items = knapsack.branch_and_bound_knapsack(capacity, values, costs)
+    expected = knapsack.optimal_knapsack(capacity, values, costs)
+    assert sum(costs[i] for i in included_items) <= capacity
+    assert sum(values[i] for i in included_items) == sum(values[i] for i in expected)
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+@pytest.mark.parametrize(
+    'capacity, values, costs, epsilon',
+    [
+        (100, [5, 12, 3, 7, 9, 14, 2, 8], [17, 31, 9, 22, 25, 40, 3, 20], 0.5),
+        (100, [5, 12, 3, 7, 9, 14, 2, 8], [17, 31, 9, 22, 25, 40, 3, 20], 0.01),
+        (50, [1, 8, 10, 20, 0.5, 7.25], [22, 32, 41, 173, 1, 9], 0.2),
+        (940000, [1, 8, 10, 20], [218400, 316300, 404600, 1722600], 0.1),
+        (0, [1, 2], [1, 1], 0.1),
+        # Testing items costing nothing are always taken and one item worth far more than the rest is still found
+        (10, [3, 2, 4, 0.01], [0, 5, 6, 0], 0.1),
+        (60, [1000, 1, 2, 3, 2, 1], [50, 5, 10, 15, 10, 5], 0.3),
+        (2000, [round(1 + (i * 7.3) % 29, 1) for i in range(60)], [10 + (i * 13) % 71 for i in range(60)], 0.05),
+    ],
+)
+# Testing the approximate knapsack reaches (1 - epsilon) of the best value and its upper bound holds, with and without
+# NumPy
+def test_fptas_knapsack(capacity, values, costs, epsilon, use_numpy, monkeypatch):
+    if not use_numpy:
+        monkeypatch.setattr(knapsack, 'np', None)
+    included_items = knapsack.fptas_knapsack(capacity, values, costs, epsilon)
+    best_value = sum(values[i] for i in knapsack.pareto_knapsack(capacity, values, costs))
+    found_value = sum(values[i] for i in included_items)
+    assert sum(costs[i] for i in included_items) <= capacity
+    assert found_value >= (1 - epsilon) * best_value
+    assert knapsack.get_fptas_upper_bound(capacity, values, costs, included_items, epsilon) >= best_value
+
+
+@pytest.mark.parametrize(
+    'epsilon',
+    [0, 1, -0.5, 'a'],
+)
+# Testing the validation of epsilon in the approximate knapsack
+def test_fptas_knapsack_error(epsilon):
+    with pytest.raises(AssertionError) as e:
+        knapsack.fptas_knapsack(8, [1, 2, 5, 6], [2, 3, 4, 5], epsilon)
+    assert e.value.args[0] == 'Input "epsilon" needs to be numeric and between 0 and 1'
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+# Testing the incremental knapsack gives the same best value as solving again after every edit, with both engines
+def test_incremental_knapsack(use_numpy, monkeypatch):
+    if not use_numpy:
+        monkeypatch.setattr(knapsack, 'np', None)
+    values = [5, 12, 3, 7, 9, 14, 2, 8]
+    costs = [17, 31, 9, 22, 25, 40, 3, 20]
+    incremental = knapsack.IncrementalKnapsack(100, values[:6], costs[:6])
+
+    def assert_matches_full_solve():
+        expected = knapsack.optimal_knapsack(100, values, costs)
+        included_items = incremental.get_included_items()
+        assert sum(values[i] for i in included_items) == sum(values[i] for i in expected)
+        assert incremental.get_best_value() == sum(values[i] for i in expected)
+
+    for value, cost in zip(values[6:], costs[6:]):
+        incremental.append(value, cost)
+    assert_matches_full_solve()
+    incremental.remove(2)
+    del values[2], costs[2]
+    assert_matches_full_solve()
+    incremental.replace(0, 11, 12)
+    values[0], costs[0] = 11, 12
+    assert_matches_full_solve()
+
+    # Testing the best value without each item matches solving without it
+    for index in range(len(values)):
+        other_values = values[:index] + values[index + 1:]
+        other_costs = costs[:index] + costs[index + 1:]
+        for budget in [0, 37, 100]:
+            expected = knapsack.optimal_knapsack(budget, other_values, other_costs)
+            assert incremental.get_best_value_without(index, budget) == sum(other_values[i] for i in expected)
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+# Testing the best value without an item keeps the items costing nothing on both sides of it
+def test_incremental_knapsack_free_items(use_numpy, monkeypatch):
+    if not use_numpy:
+        monkeypatch.setattr(knapsack, 'np', None)
+    values = [5, 1, 4, 1, 1, 4]
+    costs = [3, 15, 1, 4, 11, 0]
+    incremental = knapsack.IncrementalKnapsack(20, [0.5] + values, [0] + costs)
+    assert incremental.get_best_value_without(4, 1) == 8.5
+    for index in range(len(values) + 1):
+        other_values = ([0.5] + values)[:index] + ([0.5] + values)[index + 1:]
+        other_costs = ([0] + costs)[:index] + ([0] + costs)[index + 1:]
+        for budget in range(21):
+            expected = knapsack.brute_force_knapsack(budget, other_values, other_costs)
+            assert incremental.get_best_value_without(index, budget) == sum(other_values[i] for i in expected)
+
+
+@pytest.mark.parametrize(
+    'capacity, values, costs',
+    [
+        (8, [1, 2, 5, 6], [2, 3, 4, 5]),
+        (100, [5, 12, 3, 7, 9, 14, 2, 8], [17, 31, 9, 22, 25, 40, 3, 20]),
+        (50, [1, 8, 10, 20, 0.5, 7.25], [22, 32, 41, 173, 1, 9]),
+        (0, [1, 2], [1, 1]),
+        (10, [], []),
+    ],
+)
+# Testing the brute force knapsack finds the same best value as the full matrix
+def test_brute_force_knapsack(capacity, values, costs):
+    included_items = knapsack.brute_force_knapsack(capacity, values, costs)
+    expected = knapsack.optimal_knapsack(capacity, values, costs)
+    assert sum(costs[i] for i in included_items) <= capacity
+    assert sum(values[i] for i in included_items) == sum(values[i] for i in expected)
+    assert included_items == sorted(included_items, reverse=True)
+
+
+@pytest.mark.parametrize(
+    'capacity, costs, solver, epsilon, expected',
+    [
+        # Testing a requested solver overrides the automatic choice
+        (200, [22, 32, 41, 173], 'pareto', None, 'pareto'),
+        # Testing brute force is picked for a handful of items and dropped above 20 items
+        (200, [22, 32, 41, 173], None, None, 'brute_force'),
+        (20000, [500] * 21, None, None, 'dense'),
+        # Testing the Pareto frontier is picked for a huge budget when the costs are all close together
+        (500000, [500, 501] * 20, None, None, 'pareto'),
+        # Testing branch and bound is picked for a few items with a huge budget and costs which vary a lot
+        (50000, list(range(1001, 26001, 1000)), None, None, 'branch_and_bound'),
+        # Testing the dense table is picked for many items with a small budget
+        (300, list(range(1, 301)), None, None, 'dense'),
+        # Testing the approximate solver is only picked when an epsilon is given
+        (500000, list(range(1001, 101001, 1000)), None, None, 'dense'),
+        (500000, list(range(1001, 101001, 1000)), None, 0.5, 'fptas'),
+        # Testing thousands of items are costed without the branch and bound estimate overflowing
+        (3000, list(range(1, 4001)), None, None, 'dense'),
+        (3000, list(range(1, 4001)), None, 0.5, 'dense'),
+    ],
+)
+# Testing the automatic choice of solver from the shape of the problem, without NumPy so the costs are fixed
+def test_select_solver(capacity, costs, solver, epsilon, expected, monkeypatch):
+    monkeypatch.setattr(knapsack, 'np', None)
+    assert knapsack.select_solver(capacity, costs, solver, epsilon) == expected
+
+
+# Testing the validation of the requested solver
+def test_select_solver_error():
+    with pytest.raises(AssertionError) as e:
+        knapsack.select_solver(8, [2, 3, 4, 5], 'magic')
+    assert e.value.args[0].startswith('Input "solver" needs to be one of dense, linear, pareto')
+
+
+@pytest.mark.parametrize(
+    'max_memory, expected',
+    [
+        (None, 'dense'),
+        # Testing the linear memory knapsack is picked when the decision table does not fit in memory
+        (10 ** 8, 'linear'),
+    ],
+)
+# Testing the memory limit of the automatic choice of solver
+def test_select_solver_memory(max_memory, expected, monkeypatch):
+    monkeypatch.setattr(knapsack, 'np', None)
+    costs = list(range(1001, 101001, 1000)) * 20
+    assert knapsack.select_solver(500000, costs, max_memory=max_memory) == expected
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+# Testing the linear memory knapsack finds an optimal value with and without NumPy
+def test_linear_knapsack(use_numpy, monkeypatch):
+    if not use_numpy:
+        monkeypatch.setattr(knapsack, 'np', None)
+    values = [3, 4, 5, 6, 0, 2.5, 7, 1]
+    costs = [2, 3, 4, 5, 1, 0, 6, 2]
+    for capacity in range(0, 25):
+        included_items = knapsack.linear_knapsack(capacity, values, costs)
+        expected_items = knapsack.brute_force_knapsack(capacity, values, costs)
+        assert sum(costs[i] for i in included_items) <= capacity
+        assert sum(values[i] for i in included_items) == sum(values[i] for i in expected_items)
+        assert included_items == sorted(included_items, reverse=True)
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+@pytest.mark.parametrize(
+    'capacity, values, costs, expected',
+    [
+        # Testing the cheaper option of a group is taken to fit another group in the budget
+        (10, [[5, 5], [4]], [[8, 6], [4]], [1, 0]),
+        # Testing the first option is kept when a later option only equals it
+        (20, [[5, 5], [4]], [[8, 6], [4]], [0, 0]),
+        # Testing a group is left out when none of its options fit
+        (5, [[5, 5], [4]], [[8, 6], [4]], [None, 0]),
+        (0, [[5, 5], [4]], [[8, 6], [4]], [None, None]),
+        # Testing an empty group and a group with a better but more expensive option
+        (9, [[], [3, 7], [2]], [[], [2, 7], [2]], [None, 1, 0]),
+        # Testing a group with more options than fit in a byte
+        (600, [list(range(1, 301)), [1000]], [list(range(1, 301)), [400]], [199, 0]),
+    ],
+)
+# Testing the multiple-choice knapsack with and without NumPy
+def test_multiple_choice_knapsack(capacity, values, costs, expected, use_numpy, monkeypatch):
+    if not use_numpy:
+        monkeypatch.setattr(knapsack, 'np', None)
+    assert knapsack.multiple_choice_knapsack(capacity, values, costs) == expected
+
+
+@pytest.mark.parametrize(
+    'capacities, values, costs, expected',
+    [
+        # Testing items are spread over the knapsacks to take everything
+        ([10, 6], [6, 5, 4, 3], [6, 5, 4, 1], [0, 1, 0, 1]),
+        # Testing the first knapsack is used when several are equally good and items which never fit are left out
+        ([5, 5], [3, 1, 4], [4, 1, 6], [0, 0, None]),
+        ([0, 0], [3, 1], [4, 1], [None, None]),
+        ([], [3, 1], [4, 1], [None, None]),
+    ],
+)
+# Testing the exact multiple knapsack
+def test_exact_multiple_knapsack(capacities, values, costs, expected):
+    assert knapsack.exact_multiple_knapsack(capacities, values, costs) == expected
+    assert knapsack.multiple_knapsack(capacities, values, costs) == (expected, True)
+
+
+# Testing the sequential heuristic fills each knapsack in turn and is used for large problems
+def test_sequential_multiple_knapsack(monkeypatch):
+    capacities = [10, 6]
+    values = [6, 5, 4, 3]
+    costs = [6, 5, 4, 1]
+    assert knapsack.sequential_multiple_knapsack(capacities, values, costs) == [1, 0, 0, 0]
+    monkeypatch.setattr(knapsack, 'MAX_EXACT_ASSIGNMENTS', 0)
+    assert knapsack.multiple_knapsack(capacities, values, costs) == ([1, 0, 0, 0], False)
+
+
+@pytest.mark.parametrize(
+    'budget, expected_pareto_set, expected_items',
+    [
+        (0, [(0, 0)], [[]]),
+        # Testing both trade-offs are kept when neither choice is better in both values
+        (5, [(5, 0), (3, 4)], [[1], [0]]),
+        (9, [(8, 4), (6, 6)], [[1, 0], [2, 0]]),
+        (20, [(12, 6)], [[3, 2, 1, 0]]),
+    ],
+)
+# Testing the pareto set of a knapsack with two values for each item
+def test_bi_objective_frontiers(budget, expected_pareto_set, expected_items):
+    frontiers = knapsack.get_bi_objective_frontiers(20, [3, 5, 3, 1], [4, 0, 2, 0], [4, 5, 4, 6])
+    pareto_set = knapsack.get_bi_objective_pareto_set(frontiers[-1], budget)
+    assert [frontiers[-1][j][1] for j in pareto_set] == expected_pareto_set
+    assert [knapsack.backtrack_pareto_frontiers(frontiers, j) for j in pareto_set] == expected_items
+
+
+
+# Testing the frontiers of a larger knapsack with two values keep exactly the states which no cheaper or equal cost
+# state matches in both values
+def test_bi_objective_frontiers_large():
+    first_values = [round(5 + (i * 3.7) % 13, 1) for i in range(25)]
+    second_values = [(i * 7) % 5 for i in range(25)]
+    costs = [10 + (i * 11) % 17 for i in range(25)]
+    frontiers = knapsack.get_bi_objective_frontiers(200, first_values, second_values, costs)
+    for frontier in frontiers[-3:]:
+        for j, state in enumerate(frontier):
+            assert not any(knapsack.is_dominated(state[1], kept_state[1]) for kept_state in frontier[:j])
+    for budget in [0, 60, 200]:
+        pareto_set = knapsack.get_bi_objective_pareto_set(frontiers[-1], budget)
+        for j in pareto_set:
+            included_items = knapsack.backtrack_pareto_frontiers(frontiers, j)
+            assert sum(costs[i] for i in included_items) <= budget
+            assert (round(sum(first_values[i] for i in included_items), 6),
+                    sum(second_values[i] for i in included_items)) == (round(frontiers[-1][j][1][0], 6),
+                                                                       frontiers[-1][j][1][1])
+        best_first_value = max(sum(first_values[i] for i in knapsack.rolling_knapsack(budget, first_values, costs)), 0)
+        assert frontiers[-1][pareto_set[0]][1][0] == pytest.approx(best_first_value)
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+@pytest.mark.parametrize(
+    'capacity, k, expected',
+    [
+        (0, 3, [[]]),
+        # Testing selections with the same value are all kept and every selection is distinct
+        (5, 3, [[1, 0], [2], [3]]),
+        (9, 4, [[2, 1, 0], [3, 2], [2, 0], [3, 0]]),
+        (20, 1, [[3, 2, 1, 0]]),
+    ],
+)
+# Testing the k best selections of the top k knapsack with and without NumPy
+def test_top_k_knapsack(capacity, k, expected, use_numpy, monkeypatch):
+    if not use_numpy:
+        monkeypatch.setattr(knapsack, 'np', None)
+    assert knapsack.top_k_knapsack(capacity, [3, 2, 4, 4], [2, 3, 4, 5], k) == expected
+    # Testing items over the budget are left out and costs with a common divisor give the same selections
+    assert knapsack.top_k_knapsack(capacity, [3, 2, 4, 9, 4], [2, 3, 4, 21, 5], k) == \
+        [[4 if i == 3 else i for i in included_items] for included_items in expected]
+    assert knapsack.top_k_knapsack(capacity * 100, [3, 2, 4, 4], [200, 300, 400, 500], k) == expected
+
+
+# Testing the validation of k
+def test_top_k_knapsack_error():
+    with pytest.raises(AssertionError) as e:
+        knapsack.top_k_knapsack(5, [3, 2], [2, 3], 0)
+    assert e.value.args[0] == 'Input "k" needs to be a positive integer'
+
+
+@pytest.mark.parametrize(
+    'capacity, expected',
+    [
+        (0, []),
+        (4, [[0], [1]]),
+        # Testing only selections worth more than every cheaper selection are listed
+        (9, [[0], [1], [1, 0], [2, 0], [2, 1]]),
+    ],
+)
+# Testing the selections offered as the options of a multiple-choice knapsack group
+def test_get_efficient_selections(capacity, expected):
+    assert knapsack.get_efficient_selections(capacity, [2, 3, 4], [2, 3, 6]) == expected
+
+
+# Testing the cache counts hits and misses and returns copies of the stored results
+def test_knapsack_cache():
+    cache = knapsack.KnapsackCache()
+    key = cache.get_key(8, [1, 2, 5, 6], [2, 3, 4, 5], 'dense')
+    assert key == cache.get_key(8, (1, 2, 5, 6), (2, 3, 4, 5), 'dense')
+    assert key != cache.get_key(8, [1, 2, 5, 6], [2, 3, 4, 5], 'pareto')
+    assert key != cache.get_key(8, [1, 2, 5, 6], [2, 3, 4, 5], 'dense', epsilon=0.1)
+    assert cache.get(key) is None
+    result = knapsack.reduced_knapsack(8, [1, 2, 5, 6], [2, 3, 4, 5])
+    cache.put(key, result)
+    cached_result = cache.get(key)
+    assert cached_result == result
+    cached_result[0].append(0)
+    assert cache.get(key) == result
+    assert cache.get_statistics() == dict(hits=2, misses=1, num_results=1, memory=cache.memory)
+    cache.clear()
+    assert cache.get_statistics() == dict(hits=0, misses=0, num_results=0, memory=0)
+
+
+# Testing the least recently used results are dropped to stay within the memory limit
+def test_knapsack_cache_memory_limit():
+    result = ([3, 1], dict(num_items=4))
+    cache = knapsack.KnapsackCache(max_memory=len(knapsack.pickle.dumps(result)) * 2)
+    cache.put('a', result)
+    cache.put('b', result)
+    cache.get('a')
+    cache.put('c', result)
+    assert list(cache.results) == ['a', 'c']
+    assert cache.memory <= cache.max_memory
+    cache.put('d', (list(range(1000)), dict()))
+    assert 'd' not in cache.results
+
+
+# Testing the cached reduced knapsack gives the same result as solving the problem
+def test_cached_reduced_knapsack():
+    knapsack.KNAPSACK_CACHE.clear()
+    result = knapsack.cached_reduced_knapsack(100, [5, 12, 3, 7, 9], [17, 31, 9, 22, 25], 'pareto')
+    assert result == knapsack.reduced_knapsack(100, [5, 12, 3, 7, 9], [17, 31, 9, 22, 25], 'pareto')
+    assert knapsack.cached_reduced_knapsack(100, [5, 12, 3, 7, 9], [17, 31, 9, 22, 25], 'pareto') == result
+    assert knapsack.KNAPSACK_CACHE.get_statistics()['hits'] == 1
+    assert knapsack.KNAPSACK_CACHE.get_statistics()['misses'] == 1
+
+
+@pytest.mark.parametrize(
+    'amount, expected',
+    [
+        (0, [0, 0, 0, 0]),
+        (35, [1, 1, 0, 0]),
+        # Testing a bigger size is bought when it is cheaper than covering the amount exactly
+        (45, [0, 0, 1, 0]),
+        (250, [0, 0, 1, 2]),
+        (7, [1, 0, 0, 0]),
+    ],
+)
+# Testing the cheapest mix of sizes covering an amount
+def test_min_cost_cover(amount, expected):
+    assert knapsack.min_cost_cover(amount, [10, 25, 50, 100], [15, 30, 45, 80]) == expected
+
+
+# Testing the cover table is built once for each catalogue, in steps of the greatest common divisor of the sizes, and
+# grown when a larger amount is asked for
+def test_min_cost_cover_memoised(monkeypatch):
+    knapsack.MIN_COST_COVER_TABLES.clear()
+    knapsack.min_cost_cover(30, [10, 25], [15, 30])
+    knapsack.min_cost_cover(20, [10, 25], [15, 30])
+    assert len(knapsack.MIN_COST_COVER_TABLES[((2, 5), (15, 30))][0]) == 7
+    knapsack.min_cost_cover(41, [10, 25], [15, 30])
+    assert len(knapsack.MIN_COST_COVER_TABLES[((2, 5), (15, 30))][0]) == 10
+    knapsack.min_cost_cover(40, [10, 25], [15, 31])
+    assert len(knapsack.MIN_COST_COVER_TABLES) == 2
+
+    # Testing the least recently used tables are dropped over the limit
+    monkeypatch.setattr(knapsack, 'MAX_MIN_COST_COVER_TABLES', 2)
+    knapsack.min_cost_cover(40, [10, 25], [15, 30])
+    knapsack.min_cost_cover(40, [10, 25], [15, 32])
+    assert list(knapsack.MIN_COST_COVER_TABLES) == [((2, 5), (15, 30)), ((2, 5), (15, 32))]
+
+
+# Testing covering thousands of litres in millilitres with the usual tin sizes is quick and covers the amount
+def test_min_cost_cover_large_amount():
+    sizes = [1000, 2500, 5000, 10000]
+    counts = knapsack.min_cost_cover(4999999, sizes, [12, 22, 37.87, 65])
+    assert sum(count * size for count, size in zip(counts, sizes)) >= 4999999
+    assert counts == [0, 0, 0, 500]